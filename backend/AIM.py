@@ -1,11 +1,110 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
 import os
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, OpenAI
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Load `.env` from project root if present (once per process, at import)
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_DOTENV_PATH = _PROJECT_ROOT / ".env"
+if _DOTENV_PATH.exists():
+    load_dotenv(_DOTENV_PATH)
+else:
+    # Fall back to default search (current working directory)
+    load_dotenv()
+_OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+
+# Async throttling defaults sized for budgeting traffic: bounded in-flight
+# requests plus a token bucket that keeps steady-state QPM under the limit
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_QPM = 500
+
+# Transient failures (429, 5xx, network) are retried with exponential backoff
+MAX_ATTEMPTS = 3
+MAX_BACKOFF_SECONDS = 30.0
+
+# The model catalog changes on the order of hours
+MODELS_CACHE_TTL_SECONDS = 600.0
+
+# Replies to temperature=0 requests are memoized per client. The provider
+# default temperature (None) samples, so those are never cached.
+RESPONSE_CACHE_SIZE = 1024
+
+# Opt-in semantic cache for paraphrased prompts (needs sentence-transformers + faiss)
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+# The SDK's default async pool is too small for wide fan-outs; use one tuned
+# pool per event loop instead.
+_ASYNC_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=200)
+_ASYNC_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+@lru_cache(maxsize=1)
+def _get_client(api_key: str) -> OpenAI:
+    """Process-wide sync SDK client so keep-alive connections are shared."""
+    # Retries are handled by OpenRouterClient, not the SDK
+    client = OpenAI(base_url=OPENROUTER_BASE_URL, api_key=api_key, max_retries=0)
+    atexit.register(client.close)
+    return client
+
+
+def _new_async_client(api_key: str) -> AsyncOpenAI:
+    http_client = httpx.AsyncClient(
+        limits=_ASYNC_HTTP_LIMITS,
+        timeout=_ASYNC_HTTP_TIMEOUT,
+        # HTTP/2 needs the optional `h2` package
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+    return AsyncOpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+class _LoopState:
+    """Async SDK client and throttles bound to one event loop."""
+
+    __slots__ = ("aclient", "sem", "limiter", "closer")
+
+    def __init__(self, api_key: str, max_concurrency: int, qpm: int) -> None:
+        self.aclient = _new_async_client(api_key)
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self.limiter = AsyncLimiter(qpm, 60)
+        # The loop tracks async generators only weakly; keep the closer alive here
+        self.closer: Optional[AsyncIterator[None]] = None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    # Connection errors and timeouts are always transient; of the HTTP errors
+    # only rate limiting and server-side failures are worth another attempt.
+    if isinstance(exc, APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return True
+
+
+def _backoff_delay(attempt: int) -> float:
+    return min(2 ** attempt + random.random(), MAX_BACKOFF_SECONDS)
 
 
 class OpenRouterClient:
@@ -23,32 +122,45 @@ class OpenRouterClient:
             ]
         )
         print(reply)
+
+    For concurrent workloads use the async variants:
+
+        replies = await client.chat_many([messages_a, messages_b])
     """
 
     def __init__(
         self,
         *,
         api_key: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        qpm: int = DEFAULT_QPM,
     ) -> None:
-        # Load `.env` from project root if present
-        project_root = Path(__file__).resolve().parents[1]
-        dotenv_path = project_root / ".env"
-        if dotenv_path.exists():
-            load_dotenv(dotenv_path)
-        else:
-            # Fall back to default search (current working directory)
-            load_dotenv()
-
-        self.api_key: str = api_key or os.getenv("OPENROUTER_API_KEY", "")
+        self.api_key: str = api_key or _OPENROUTER_API_KEY
         if not self.api_key:
             raise RuntimeError(
                 "Missing OPENROUTER_API_KEY. Set it in .env or the environment."
             )
 
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.api_key,
-        )
+        self.client = _get_client(self.api_key)
+        # Async callers share these limits; share the client to share the budget.
+        # The async SDK client and asyncio primitives bind to one event loop, so
+        # each loop gets its own set, dropped when the loop goes away.
+        self._max_concurrency = max_concurrency
+        self._qpm = qpm
+        self._loop_states: "weakref.WeakKeyDictionary[Any, _LoopState]" = weakref.WeakKeyDictionary()
+        self._loop_states_lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Number of retried completion calls, for observability
+        self.retry_count = 0
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+        self._models_lock = threading.Lock()
+        # Lazily initialized on the first semantic_cache=True call. Replies are only
+        # reused within a partition of the same model, system prompt and output options.
+        self._embedder: Any = None
+        self._new_semantic_index: Any = None
+        self._semantic_partitions: Dict[str, Tuple[Any, List[str]]] = {}
+        self._semantic_lock = threading.Lock()
 
     def chat(
         self,
@@ -58,33 +170,390 @@ class OpenRouterClient:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         json_mode: bool = False,
+        cache: bool = True,
+        semantic_cache: bool = False,
+        semantic_threshold: float = SEMANTIC_CACHE_THRESHOLD,
     ) -> str:
         """Send a chat completion request and return the assistant's text content.
 
         - `messages`: List of {role, content} per OpenAI spec
         - `model`: Any model available on OpenRouter (default: openrouter/auto)
         - `json_mode`: If True, requests a JSON object response format
+        - `cache`: If True, identical requests made with an explicit temperature=0
+          are answered from an in-process LRU cache
+        - `semantic_cache`: If True, near-duplicate user prompts (cosine similarity
+          above `semantic_threshold`) reuse an earlier reply; ignored in JSON mode
+        """
+        key = None
+        if cache and temperature == 0:
+            key = self._cache_key(model, messages, temperature, max_tokens, json_mode)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        query_vec = partition = None
+        if semantic_cache and not json_mode:
+            partition = self._semantic_partition_key(model, messages, max_tokens, json_mode)
+            query_vec, cached = self._semantic_lookup(partition, messages, semantic_threshold)
+            if cached is not None:
+                return cached
+
+        content = "".join(self.iter_chat(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+        ))
+        if key is not None:
+            self._cache_put(key, content)
+        if query_vec is not None:
+            self._semantic_store(partition, query_vec, content)
+        return content
+
+    async def achat(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        model: str = "google/gemini-2.5-flash-lite",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+        cache: bool = True,
+        semantic_cache: bool = False,
+        semantic_threshold: float = SEMANTIC_CACHE_THRESHOLD,
+    ) -> str:
+        """Async counterpart of `chat` that does not block the event loop.
+
+        Calls are capped at `max_concurrency` in flight and `qpm` per minute.
+        """
+        key = None
+        if cache and temperature == 0:
+            key = self._cache_key(model, messages, temperature, max_tokens, json_mode)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        query_vec = partition = None
+        if semantic_cache and not json_mode:
+            partition = self._semantic_partition_key(model, messages, max_tokens, json_mode)
+            query_vec, cached = self._semantic_lookup(partition, messages, semantic_threshold)
+            if cached is not None:
+                return cached
+
+        parts = []
+        async for text in self.aiter_chat(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+        ):
+            parts.append(text)
+        content = "".join(parts)
+        if key is not None:
+            self._cache_put(key, content)
+        if query_vec is not None:
+            self._semantic_store(partition, query_vec, content)
+        return content
+
+    def chat_json(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        model: str = "google/gemini-2.5-flash-lite",
+        **kwargs: Any,
+    ) -> Any:
+        """Send a JSON-mode chat request and return the parsed reply.
+
+        Raises `orjson.JSONDecodeError` (a `ValueError`) if the model returns invalid JSON.
+        """
+        return orjson.loads(self.chat(messages=messages, model=model, json_mode=True, **kwargs))
+
+    def iter_chat(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        model: str = "google/gemini-2.5-flash-lite",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+    ) -> Iterator[str]:
+        """Stream the assistant's reply, yielding text fragments as they arrive.
+
+        Lets callers render or post-process before the last token lands.
+        Streams bypass the response caches.
         """
         response_format = {"type": "json_object"} if json_mode else None
 
-        completion = self.client.chat.completions.create(
+        stream = self._create_completion(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             response_format=response_format,  # type: ignore[arg-type]
+            stream=True,
+        )
+        for chunk in stream:
+            text = self._delta_text(chunk)
+            if text:
+                yield text
+
+    async def aiter_chat(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        model: str = "google/gemini-2.5-flash-lite",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+    ) -> AsyncIterator[str]:
+        """Async counterpart of `iter_chat`; holds a concurrency slot until the stream ends."""
+        response_format = {"type": "json_object"} if json_mode else None
+
+        state = self._loop_state()
+        async with state.sem, state.limiter:
+            stream = await self._acreate_completion(
+                state.aclient,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,  # type: ignore[arg-type]
+                stream=True,
+            )
+            async for chunk in stream:
+                text = self._delta_text(chunk)
+                if text:
+                    yield text
+
+    async def chat_many(
+        self,
+        batch: List[List[Dict[str, Any]]],
+        **kwargs: Any,
+    ) -> List[str]:
+        """Run several chat requests concurrently; replies keep the input order."""
+        return list(
+            await asyncio.gather(*[self.achat(messages=m, **kwargs) for m in batch])
+        )
+
+    def _loop_state(self) -> _LoopState:
+        """Return the async client and limits for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._loop_states_lock:
+            state = self._loop_states.get(loop)
+            if state is None:
+                state = _LoopState(self.api_key, self._max_concurrency, self._qpm)
+                self._loop_states[loop] = state
+                state.closer = self._release_at_loop_shutdown(loop, state)
+                # Run it up to its yield from inside the loop so the loop tracks it
+                asyncio.ensure_future(state.closer.__anext__())
+            return state
+
+    async def _release_at_loop_shutdown(self, loop: Any, state: _LoopState) -> AsyncIterator[None]:
+        """Stay parked until `loop` shuts down, then close its client and forget its state.
+
+        `asyncio.run()` finalizes parked async generators (`loop.shutdown_asyncgens()`)
+        before closing the loop, so the pool is closed while it can still be awaited.
+        A semaphore that has had waiters holds its loop, so the weak key alone
+        would never let the entry go.
+        """
+        try:
+            yield
+        finally:
+            with self._loop_states_lock:
+                self._loop_states.pop(loop, None)
+            await state.aclient.close()
+
+    def _create_completion(self, **kwargs: Any) -> Any:
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except (APIStatusError, APIConnectionError) as exc:
+                if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(exc):
+                    raise
+                self.retry_count += 1
+                time.sleep(_backoff_delay(attempt))
+
+    async def _acreate_completion(self, aclient: AsyncOpenAI, **kwargs: Any) -> Any:
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return await aclient.chat.completions.create(**kwargs)
+            except (APIStatusError, APIConnectionError) as exc:
+                if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(exc):
+                    raise
+                self.retry_count += 1
+                await asyncio.sleep(_backoff_delay(attempt))
+
+    @staticmethod
+    def _cache_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool,
+    ) -> str:
+        payload = orjson.dumps(
+            {"model": model, "messages": messages, "t": temperature, "mx": max_tokens, "j": json_mode},
+            option=orjson.OPT_SORT_KEYS,
         )
+        return hashlib.sha256(payload).hexdigest()
 
-        choice = completion.choices[0]
-        # Prefer `message.content` when present; fall back to tool outputs
-        content = getattr(choice.message, "content", None)
-        if content:
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            content = self._cache.get(key)
+            if content is not None:
+                self._cache.move_to_end(key)
             return content
-        # Graceful fallback for unexpected shapes
-        return ""
+
+    def _cache_put(self, key: str, content: str) -> None:
+        with self._cache_lock:
+            self._cache[key] = content
+            self._cache.move_to_end(key)
+            if len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _semantic_partition_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int],
+        json_mode: bool,
+    ) -> str:
+        system = [m.get("content") for m in messages if m.get("role") == "system"]
+        payload = orjson.dumps(
+            {"model": model, "system": system, "mx": max_tokens, "j": json_mode},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def _semantic_lookup(
+        self, partition: str, messages: List[Dict[str, Any]], threshold: float
+    ) -> Tuple[Any, Optional[str]]:
+        """Embed the user turns and return (vector, cached reply in `partition` or None)."""
+        with self._semantic_lock:
+            if self._embedder is None:
+                import faiss
+                from sentence_transformers import SentenceTransformer
+
+                self._embedder = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+                self._new_semantic_index = partial(
+                    faiss.IndexFlatIP, self._embedder.get_sentence_embedding_dimension()
+                )
+
+        query = "\n".join(
+            str(m.get("content", "")) for m in messages if m.get("role") == "user"
+        )
+        # Normalized embeddings make inner product equal to cosine similarity
+        vec = self._embedder.encode([query], normalize_embeddings=True)
+        with self._semantic_lock:
+            entry = self._semantic_partitions.get(partition)
+            if entry is not None and entry[0].ntotal:
+                index, responses = entry
+                scores, ids = index.search(vec, 1)
+                if scores[0][0] > threshold:
+                    return vec, responses[ids[0][0]]
+        return vec, None
+
+    def _semantic_store(self, partition: str, vec: Any, content: str) -> None:
+        with self._semantic_lock:
+            entry = self._semantic_partitions.get(partition)
+            if entry is None:
+                entry = (self._new_semantic_index(), [])
+                self._semantic_partitions[partition] = entry
+            index, responses = entry
+            index.add(vec)
+            responses.append(content)
+
+    @staticmethod
+    def _delta_text(chunk: Any) -> str:
+        # Keep-alive and usage chunks arrive without choices
+        if not chunk.choices:
+            return ""
+        # Graceful fallback for deltas without text (e.g. role-only or tool calls)
+        return getattr(chunk.choices[0].delta, "content", None) or ""
+
+    def submit_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        *,
+        client: OpenAI,
+        model: Optional[str] = None,
+    ) -> str:
+        """Submit non-interactive chat requests through the Batch API; return the batch ID.
+
+        OpenRouter has no /files or /batches endpoints, so `client` must point at a
+        batch-capable provider (e.g. `OpenAI(api_key=...)`); pass the same client to
+        `wait_for_batch`. Each request is a dict of `chat.completions.create`
+        arguments (at least `messages`). `model` names that provider's model for
+        requests that do not set their own; OpenRouter slugs will not work there.
+        Batches trade a 24h completion window for lower cost and higher rate limits,
+        so use them only when nobody is waiting on the reply.
+
+        Raises `ValueError` if a request has no model and `model` is not given.
+        """
+        lines = []
+        for idx, body in enumerate(requests):
+            if "model" not in body:
+                if model is None:
+                    raise ValueError(f"Batch request {idx} has no model; pass model= or set it per request")
+                body = {"model": model, **body}
+            lines.append(orjson.dumps({
+                "custom_id": f"request-{idx}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+        batch_file = client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def wait_for_batch(self, batch_id: str, *, client: OpenAI, poll: float = 30) -> List[str]:
+        """Block until a batch finishes and return replies aligned to the submitted order.
+
+        `client` is the batch-capable client the batch was submitted with.
+        Requests that errored inside the batch come back as empty strings.
+        """
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+            time.sleep(poll)
+
+        replies: Dict[int, str] = {}
+        if batch.output_file_id:
+            output = client.files.content(batch.output_file_id).content
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                idx = int(record["custom_id"].rsplit("-", 1)[1])
+                response = record.get("response") or {}
+                choices = (response.get("body") or {}).get("choices") or []
+                content = choices[0].get("message", {}).get("content") if choices else None
+                replies[idx] = content or ""
+
+        total = batch.request_counts.total if batch.request_counts else len(replies)
+        return [replies.get(idx, "") for idx in range(total)]
 
     def list_models(self) -> List[str]:
-        """Return available model IDs from OpenRouter."""
-        models = self.client.models.list()
-        return [m.id for m in models.data]
+        """Return available model IDs from OpenRouter (cached for 10 minutes)."""
+        with self._models_lock:
+            if self._models_cache is not None:
+                fetched_at, ids = self._models_cache
+                if time.monotonic() - fetched_at < MODELS_CACHE_TTL_SECONDS:
+                    return list(ids)
+            models = self.client.models.list()
+            ids = [m.id for m in models.data]
+            self._models_cache = (time.monotonic(), ids)
+            return list(ids)
 
@@ -0,0 +1,79 @@
+"""
+Numeric kernels for BucketManager's percentage array.
+
+The kernels are compiled with Numba when it is installed and fall back to
+plain NumPy otherwise, so callers never need to know which one they got.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+def _rescale_numpy(pcts: np.ndarray, keep_mask: np.ndarray, target: float) -> float:
+    total = float(pcts[keep_mask].sum())
+    if total != 0.0:
+        pcts[keep_mask] *= target / total
+    return total
+
+
+def _scale_numpy(pcts: np.ndarray, factor: float) -> None:
+    pcts *= factor
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _rescale_jit(pcts, keep_mask, target):
+        total = 0.0
+        for i in range(pcts.shape[0]):
+            if keep_mask[i]:
+                total += pcts[i]
+        if total != 0.0:
+            factor = target / total
+            for i in range(pcts.shape[0]):
+                if keep_mask[i]:
+                    pcts[i] *= factor
+        return total
+
+    @njit(cache=True)
+    def _scale_jit(pcts, factor):
+        for i in range(pcts.shape[0]):
+            pcts[i] *= factor
+
+    # Compile now so the first budget operation doesn't pay for it
+    _rescale_jit(np.zeros(1), np.ones(1, dtype=np.bool_), 0.0)
+    _scale_jit(np.zeros(1), 1.0)
+
+
+def rescale(pcts: np.ndarray, keep_mask: np.ndarray, target: float) -> float:
+    """
+    Scale the masked percentages in place so that they sum to `target`.
+
+    Args:
+        pcts (np.ndarray): Contiguous float64 percentages, modified in place
+        keep_mask (np.ndarray): Boolean mask of the slots to scale
+        target (float): Desired sum of the masked slots
+
+    Returns:
+        float: Sum of the masked slots before scaling; nothing is scaled when it is 0
+    """
+    if njit is not None:
+        return _rescale_jit(pcts, keep_mask, target)
+    return _rescale_numpy(pcts, keep_mask, target)
+
+
+def scale_in_place(pcts: np.ndarray, factor: float) -> None:
+    """
+    Multiply every percentage by `factor` in place.
+
+    Args:
+        pcts (np.ndarray): Contiguous float64 percentages, modified in place
+        factor (float): Scaling factor
+    """
+    if njit is not None:
+        _scale_jit(pcts, factor)
+    else:
+        _scale_numpy(pcts, factor)
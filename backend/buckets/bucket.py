@@ -5,6 +5,8 @@ A class that represents a budget allocation as a percentage.
 Supports resizing.
 """
 
+from typing import Any, Optional
+
 
 class Bucket:
     """
@@ -13,7 +15,12 @@ class Bucket:
     Attributes:
         name (str): The name of the bucket
         percentage (float): The percentage allocation
+
+    A bucket owned by a BucketManager is a view onto the manager's
+    percentage array; reads and writes go through to that storage.
     """
+
+    __slots__ = ("name", "_percentage", "_manager", "_index")
     
     def __init__(self, name: str, percentage: float):
         """
@@ -24,7 +31,21 @@ class Bucket:
             percentage (float): Percentage allocation
         """
         self.name = name
-        self.percentage = percentage
+        self._percentage = percentage
+        # Set while the bucket is owned by a BucketManager
+        self._manager: Optional[Any] = None
+        self._index = -1
+
+    @property
+    def percentage(self) -> float:
+        """The percentage allocation."""
+        if self._manager is None:
+            return self._percentage
+        return self._manager._pcts.item(self._index)
+
+    @percentage.setter
+    def percentage(self, value: float) -> None:
+        self.resize_percentage(value)
     
     def resize_percentage(self, new_percentage: float) -> None:
         """
@@ -33,7 +54,10 @@ class Bucket:
         Args:
             new_percentage (float): New percentage
         """
-        self.percentage = new_percentage
+        if self._manager is None:
+            self._percentage = new_percentage
+        else:
+            self._manager._set_percentage(self._index, new_percentage)
     
     def get_percentage(self) -> float:
         """
@@ -42,7 +66,22 @@ class Bucket:
         Returns:
             float: Current percentage
         """
-        return self.percentage
+        # Kept for API; internal code reads .percentage. Reads the slot
+        # directly instead of hopping through the property.
+        if self._manager is None:
+            return self._percentage
+        return self._manager._pcts.item(self._index)
+
+    def _bind(self, manager: Any, index: int) -> None:
+        """Attach the bucket to a manager slot (the manager holds the value)."""
+        self._manager = manager
+        self._index = index
+
+    def _unbind(self) -> None:
+        """Detach from the manager, keeping the last known percentage."""
+        self._percentage = self.percentage
+        self._manager = None
+        self._index = -1
     
     def __str__(self) -> str:
         """String representation of the budget bucket."""
@@ -52,4 +91,4 @@ class Bucket:
     def __repr__(self) -> str:
         """Detailed representation of the budget bucket."""
         return (f"Bucket(name='{self.name}', "
-                f"percentage={self.percentage})")
\ No newline at end of file
+                f"percentage={self.percentage})")
@@ -5,9 +5,27 @@ A class that manages multiple budget buckets, ensuring their percentages
 add up to 100% and providing methods for financial operations.
 """
 
-from typing import Dict, List, Optional
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.buckets._bucket_math import rescale, scale_in_place
 from backend.buckets.bucket import Bucket
 
+# Sentinel for single-probe dict lookups (slot 0 is falsy, so None checks won't do)
+_MISSING = object()
+
+# Initial slot count of the percentage array; it doubles when full
+_INITIAL_CAPACITY = 8
+
+# Running totals closer to zero than this are re-summed rather than trusted
+_TOTAL_EPS = 1e-9
+
+# Process-wide revision numbers, so a revision identifies one manager's state
+_REVISIONS = itertools.count(1)
+
 
 class BucketManager:
     """
@@ -16,7 +34,16 @@ class BucketManager:
     Attributes:
         buckets (Dict[str, Bucket]): Dictionary of bucket name to Bucket objects
         total_budget (float): Maximum budget amount to allocate across buckets
+
+    Percentages are stored struct-of-arrays style: a float64 array indexed by
+    bucket slot plus a name -> slot map, so bulk operations run as NumPy
+    kernels. Bucket objects are views onto their slot, and the total
+    percentage is maintained incrementally.
     """
+
+    # Set to True to re-sum every bucket after each mutation and catch drift
+    # of the incrementally maintained total (O(N), for debugging only).
+    debug_checks = False
     
     def __init__(self, total_budget: float = 0.0):
         """
@@ -28,6 +55,61 @@ class BucketManager:
         """
         self.buckets: Dict[str, Bucket] = {}
         self.total_budget = total_budget
+        self._names: List[str] = []
+        self._name_to_idx: Dict[str, int] = {}
+        self._pcts = np.zeros(_INITIAL_CAPACITY, dtype=np.float64)
+        self._total_pct = 0.0
+        # Memoized sorted(self._names); reset whenever the set of names changes
+        self._sorted_names: Optional[List[str]] = None
+        # (total_budget, text) memo for __str__; reset by every bucket mutation
+        self._str_cache: Optional[Tuple[float, str]] = None
+        self._rev = next(_REVISIONS)
+
+    def _active_pcts(self) -> np.ndarray:
+        """View of the percentage slots that are in use, in bucket order."""
+        return self._pcts[:len(self._names)]
+
+    def _set_percentage(self, idx: int, new_percentage: float) -> None:
+        """Write one slot and keep the running total in sync."""
+        self._total_pct += new_percentage - self._pcts.item(idx)
+        self._pcts[idx] = new_percentage
+        self._mark_changed()
+        self._settle_total()
+
+    def _mark_changed(self) -> None:
+        """Drop the __str__ memo and move to a new revision after any mutation."""
+        self._str_cache = None
+        self._rev = next(_REVISIONS)
+
+    def get_revision(self) -> int:
+        """
+        Get a number that changes whenever the budget or any bucket changes.
+        Revisions are unique across managers, so one can key a cache on its own.
+        Assigning total_budget directly, rather than through set_total_budget(),
+        does not advance it.
+        
+        Returns:
+            int: Current revision
+        """
+        return self._rev
+
+    def _resum_total(self) -> None:
+        """Recompute the total from the slots.
+
+        inf/nan cannot be subtracted back out of a running total, so once one
+        has passed through it the only way back is a full re-sum.
+        """
+        self._total_pct = float(self._active_pcts().sum())
+
+    def _settle_total(self) -> None:
+        """Re-sum after an incremental update that left the total non-finite or near zero.
+
+        A total that should have cancelled to zero can be left a few ulps
+        below it and print as -0.00%. Both cases are rare, so the O(N)
+        re-sum stays off the common path.
+        """
+        if not math.isfinite(self._total_pct) or abs(self._total_pct) < _TOTAL_EPS:
+            self._resum_total()
     
     def add_bucket(self, name: str, percentage: float, current_value: float = 0.0) -> bool:
         """
@@ -45,12 +127,23 @@ class BucketManager:
             raise ValueError(f"Bucket '{name}' already exists")
 
         # Enforce total percentage constraint via unallocated space
-        current_total = self.get_total_percentage()
-        if current_total + percentage > 100.0 + 1e-6:
+        if self._total_pct + percentage > 100.0 + 1e-6:
             return False
         
+        idx = len(self._names)
+        if idx == len(self._pcts):
+            self._pcts = np.concatenate((self._pcts, np.zeros(len(self._pcts))))
+        self._pcts[idx] = percentage
+        self._names.append(name)
+        self._name_to_idx[name] = idx
+        self._sorted_names = None
+        self._mark_changed()
+
         bucket = Bucket(name, percentage)
+        bucket._bind(self, idx)
         self.buckets[name] = bucket
+        self._total_pct += percentage
+        self._check_total()
         return True
     
     def remove_bucket(self, name: str) -> bool:
@@ -63,11 +156,33 @@ class BucketManager:
         Returns:
             bool: True if bucket was removed, False if bucket doesn't exist
         """
-        if name not in self.buckets:
+        idx = self._name_to_idx.pop(name, _MISSING)
+        if idx is _MISSING:
             return False
         
         # Remove the bucket (unallocated adjusts implicitly)
-        del self.buckets[name]
+        removed_pct = self._pcts.item(idx)
+        self.buckets.pop(name)._unbind()
+
+        # Close the gap so slots stay contiguous and in insertion order
+        count = len(self._names)
+        self._pcts[idx:count - 1] = self._pcts[idx + 1:count]
+        self._pcts[count - 1] = 0.0
+        del self._names[idx]
+        self._sorted_names = None
+        self._mark_changed()
+        for i in range(idx, count - 1):
+            moved = self._names[i]
+            self._name_to_idx[moved] = i
+            self.buckets[moved]._index = i
+
+        if self.buckets:
+            self._total_pct -= removed_pct
+            self._settle_total()
+        else:
+            # Reset exactly so float drift cannot outlive the last bucket
+            self._total_pct = 0.0
+        self._check_total()
         return True
     
     def get_bucket(self, name: str) -> Optional[Bucket]:
@@ -82,14 +197,32 @@ class BucketManager:
         """
         return self.buckets.get(name)
     
-    def get_total_percentage(self) -> float:
+    def get_total_percentage(self, exact: bool = False) -> float:
         """
-        Calculate the total percentage allocation across all buckets.
+        Get the total percentage allocation across all buckets in O(1).
+        
+        The running total can differ from a fresh sum in the last bits after
+        many updates, enough to flip a rounded digit. Pass exact=True wherever
+        the total is displayed: it re-sums the buckets in order (O(N)) and
+        leaves the running total alone.
+        
+        Args:
+            exact (bool): Re-sum the buckets instead of reading the running total
         
         Returns:
             float: Total percentage (should be <= 100.0)
         """
-        return sum(bucket.get_percentage() for bucket in self.buckets.values())
+        if exact:
+            return sum(self._active_pcts().tolist())
+        return self._total_pct
+
+    def _check_total(self) -> None:
+        """Assert the incremental total matches a full re-sum when debug_checks is on."""
+        if self.debug_checks:
+            actual = float(self._active_pcts().sum())
+            assert abs(actual - self._total_pct) < 1e-6, (
+                f"Total percentage drifted: tracked {self._total_pct}, actual {actual}"
+            )
     
     def is_percentage_valid(self) -> bool:
         """
@@ -98,8 +231,7 @@ class BucketManager:
         Returns:
             bool: True if total percentage ≤ 100% (within small epsilon), False otherwise
         """
-        total = self.get_total_percentage()
-        return total <= 100.0 + 0.01
+        return self._total_pct <= 100.0 + 0.01
     
     def get_percentage_difference(self) -> float:
         """
@@ -108,7 +240,7 @@ class BucketManager:
         Returns:
             float: Difference (positive means over 100%, negative means under 100%)
         """
-        return self.get_total_percentage() - 100.0
+        return self._total_pct - 100.0
     
     def resize_bucket(self, name: str, new_percentage: float) -> bool:
         """
@@ -121,15 +253,43 @@ class BucketManager:
         Returns:
             bool: True if resize was successful, False if it would cause invalid total percentage
         """
-        if name not in self.buckets:
+        bucket = self.buckets.get(name)
+        if bucket is None:
             raise ValueError(f"Bucket '{name}' does not exist")
+        return self._resize_bucket_unchecked(bucket, new_percentage)
+
+    def resize(self, bucket: Union[str, Bucket], new_percentage: float) -> bool:
+        """
+        Resize a bucket given by name or by a Bucket this manager owns, with
+        the same rules as resize_bucket(). Passing the Bucket from get_bucket()
+        skips a second name lookup.
         
-        old_percentage = self.buckets[name].get_percentage()
-        total_without_bucket = self.get_total_percentage() - old_percentage
+        Args:
+            bucket (Union[str, Bucket]): Bucket name, or a Bucket from get_bucket()
+            new_percentage (float): New percentage allocation
+            
+        Returns:
+            bool: True if resize was successful, False if it would cause invalid total percentage
+        
+        Raises:
+            ValueError: If the bucket doesn't exist in this manager
+        """
+        if isinstance(bucket, Bucket):
+            if bucket._manager is not self:
+                raise ValueError(f"Bucket '{bucket.name}' does not belong to this manager")
+            return self._resize_bucket_unchecked(bucket, new_percentage)
+        return self.resize_bucket(bucket, new_percentage)
+
+    def _resize_bucket_unchecked(self, bucket: Bucket, new_percentage: float) -> bool:
+        """resize_bucket for a bucket the caller has already looked up (must belong to this manager)."""
+        idx = bucket._index
+        old_percentage = self._pcts.item(idx)
+        total_without_bucket = self._total_pct - old_percentage
         
         if total_without_bucket + new_percentage > 100.0 + 1e-6:
             return False
-        self.buckets[name].resize_percentage(new_percentage)
+        self._set_percentage(idx, new_percentage)
+        self._check_total()
         return True
     
     def set_total_budget(self, amount: float) -> None:
@@ -140,6 +300,7 @@ class BucketManager:
             amount (float): New total budget amount
         """
         self.total_budget = amount
+        self._rev = next(_REVISIONS)
     
     def get_total_budget(self) -> float:
         """
@@ -163,26 +324,47 @@ class BucketManager:
         Returns:
             bool: True if successful, False if bucket doesn't exist
         """
-        if name not in self.buckets:
+        idx = self._name_to_idx.get(name, _MISSING)
+        if idx is _MISSING:
             return False
+        return self._add_amount_at(idx, amount)
+
+    def add_amount(self, bucket: Union[str, Bucket], amount: float) -> bool:
+        """
+        Add an amount (in dollars) to a bucket given by name or by a Bucket
+        this manager owns, with the same rules as add_amount_to_bucket().
+        Passing the Bucket from get_bucket() skips a second name lookup.
+        
+        Args:
+            bucket (Union[str, Bucket]): Bucket name, or a Bucket from get_bucket()
+            amount (float): Amount to add (negative to subtract)
+            
+        Returns:
+            bool: True if successful, False if the bucket doesn't exist here or
+                the change is rejected
+        """
+        if isinstance(bucket, Bucket):
+            if bucket._manager is not self:
+                return False
+            return self._add_amount_at(bucket._index, amount)
+        return self.add_amount_to_bucket(bucket, amount)
+
+    def _add_amount_at(self, idx: int, amount: float) -> bool:
+        """add_amount_to_bucket for a caller that already holds the bucket's slot."""
         if self.total_budget <= 0:
             return False
 
-        target_bucket = self.buckets[name]
-        old_pct = target_bucket.get_percentage()
-        current_dollars = (old_pct / 100.0) * self.total_budget
-        new_dollars = current_dollars + amount
-        if new_dollars < 0:
-            new_dollars = 0.0
-        new_pct = (new_dollars / self.total_budget) * 100.0
-
-        total_without_bucket = self.get_total_percentage() - old_pct
-        proposed_total = total_without_bucket + new_pct
+        old_pct = self._pcts.item(idx)
+        inv_budget = 1.0 / self.total_budget
+        # A bucket cannot go below $0
+        new_dollars = max(old_pct * 0.01 * self.total_budget + amount, 0.0)
+        new_pct = new_dollars * inv_budget * 100.0
 
         # Enforce not exceeding 100% total
-        if proposed_total > 100.0 + 1e-6:
+        if self._total_pct - old_pct + new_pct > 100.0 + 1e-6:
             return False
-        target_bucket.resize_percentage(new_pct)
+        self._set_percentage(idx, new_pct)
+        self._check_total()
         return True
     
     def subtract_amount_from_bucket(self, name: str, amount: float) -> bool:
@@ -196,9 +378,7 @@ class BucketManager:
         Returns:
             bool: True if successful, False if bucket doesn't exist
         """
-        if name not in self.buckets:
-            return False
-        # Reuse the add logic with a negative amount
+        # Reuse the add logic with a negative amount (it rejects unknown names)
         return self.add_amount_to_bucket(name, -amount)
     
     def get_bucket_names(self) -> List[str]:
@@ -208,17 +388,45 @@ class BucketManager:
         Returns:
             List[str]: List of bucket names
         """
-        return list(self.buckets.keys())
+        return list(self._names)
+
+    def snapshot(self) -> Tuple[float, float, Tuple[Tuple[str, float], ...]]:
+        """
+        Capture the whole allocation in one call, for readers that need the
+        budget, the total and every bucket together.
+        
+        Returns:
+            Tuple[float, float, Tuple[Tuple[str, float], ...]]:
+                (total_budget, total_percentage, ((name, percentage), ...)) in bucket order
+        """
+        pcts = self._active_pcts().tolist()
+        return (
+            self.total_budget,
+            sum(pcts),
+            tuple(zip(self._names, pcts)),
+        )
+
+    def get_sorted_bucket_names(self) -> List[str]:
+        """
+        Get all bucket names in sorted order. The sort is cached until a
+        bucket is added or removed.
+        
+        Returns:
+            List[str]: Sorted list of bucket names (do not mutate)
+        """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._names)
+        return self._sorted_names
     
     def get_total_current_value(self) -> float:
         """
-        Get the total allocated value across all buckets, computed from
-        percentages and the total budget.
+        Get the total allocated value across all buckets in O(1), computed
+        from the running total percentage and the total budget.
         
         Returns:
             float: Sum of allocations in dollars
         """
-        return sum((bucket.get_percentage() / 100.0) * self.total_budget for bucket in self.buckets.values())
+        return (self._total_pct / 100.0) * self.total_budget
     
     def auto_resize_to_100_percent(self) -> bool:
         """
@@ -231,44 +439,74 @@ class BucketManager:
         if not self.buckets:
             return False
 
+        pcts = self._active_pcts()
+        self._mark_changed()
+        if "rent" not in self._name_to_idx:
+            # Common case: no protected bucket, so scale every slot without a mask.
+            # Sum the array rather than trusting the running total so float
+            # drift cannot be mistaken for a non-zero allocation.
+            total = float(pcts.sum())
+            if total == 0:
+                return False
+            scale_in_place(pcts, 100.0 / total)
+            self._total_pct = 100.0
+            if not math.isfinite(total):
+                self._resum_total()
+            self._check_total()
+            return True
+
         # Separate 'rent' bucket from others
-        rent_bucket = self.buckets.get("rent")
-        other_buckets = [b for name, b in self.buckets.items() if name != "rent"]
+        rent_idx = self._name_to_idx.get("rent")
+        other_mask = np.array([name != "rent" for name in self._names], dtype=bool)
 
         # If all buckets are 'rent', nothing to do
-        if not other_buckets and rent_bucket:
+        if not other_mask.any() and rent_idx is not None:
             return True
 
-        # Compute total percentage for non-rent buckets
-        rent_pct = rent_bucket.get_percentage() if rent_bucket else 0.0
-        other_total = sum(b.get_percentage() for b in other_buckets)
+        # Scale only non-rent buckets to fill (100 - rent_pct)
+        rent_pct = pcts.item(rent_idx) if rent_idx is not None else 0.0
+        other_total = rescale(pcts, other_mask, 100.0 - rent_pct)
 
         if other_total == 0:
             # If only rent has a percentage, set it to 100%
-            if rent_bucket:
-                rent_bucket.resize_percentage(100.0)
+            if rent_idx is not None:
+                pcts[rent_idx] = 100.0
+                self._total_pct = 100.0
                 return True
             return False
 
-        # Scale only non-rent buckets to fill (100 - rent_pct)
-        scaling_factor = (100.0 - rent_pct) / other_total
-
-        for bucket in other_buckets:
-            new_percentage = bucket.get_percentage() * scaling_factor
-            bucket.resize_percentage(new_percentage)
-
-        # Leave rent bucket unchanged
+        # Leave rent bucket unchanged; the scaled buckets now fill the rest
+        self._total_pct = 100.0
+        if not math.isfinite(other_total + rent_pct):
+            self._resum_total()
+        self._check_total()
         return True
     
     def __str__(self) -> str:
-        """String representation of the BucketManager."""
-        bucket_info = "\n".join(f"  {bucket}" for bucket in self.buckets.values())
-        total_pct = self.get_total_percentage()
-        return (f"BucketManager(total_budget=${self.total_budget:.2f}, "
-                f"total_percentage={total_pct:.2f}%):\n{bucket_info}")
+        """String representation of the BucketManager (cached until the next mutation)."""
+        cached = self._str_cache
+        # Identity, not ==, so 0.0 vs -0.0 (formatted differently) never share an entry
+        if cached is not None and cached[0] is self.total_budget:
+            return cached[1]
+        pcts = self._active_pcts().tolist()
+        parts = [
+            f"BucketManager(total_budget=${self.total_budget:.2f}, "
+            f"total_percentage={sum(pcts):.2f}%):"
+        ]
+        # Same line format as Bucket.__str__, without building each Bucket's string
+        parts.extend(
+            f"  Bucket(name='{name}', percentage={pct:.2f}%)"
+            for name, pct in zip(self._names, pcts)
+        )
+        if len(parts) == 1:
+            # Keep the trailing newline the empty manager has always printed
+            parts.append("")
+        text = "\n".join(parts)
+        self._str_cache = (self.total_budget, text)
+        return text
     
     def __repr__(self) -> str:
         """Detailed representation of the BucketManager."""
         return (f"BucketManager(total_budget={self.total_budget}, "
                 f"buckets={len(self.buckets)}, "
-                f"total_percentage={self.get_total_percentage()})")
\ No newline at end of file
+                f"total_percentage={self.get_total_percentage(exact=True)})")
\ No newline at end of file
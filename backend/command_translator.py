@@ -16,10 +16,38 @@ looking at the first word in each line as the command, e.g.:
 and executes them using the actual BucketManager methods.
 """
 
-from typing import List, Optional, Tuple
+import math
+from typing import Any, List, Optional, Tuple
 
+from backend.buckets.bucket import Bucket
 from backend.buckets.bucketmanager import BucketManager
 
+# Direction of the dollar change for the commands that can be merged in a batch
+_AMOUNT_SIGNS = {'ADD_AMOUNT': 1.0, 'SUBTRACT_AMOUNT': -1.0}
+
+# A parsed amount command: (line, command type, bucket name, amount, signed delta)
+_AmountOp = Tuple[str, str, str, float, float]
+
+# Result messages, formatted positionally by the handlers below
+_MSG_SET_BUDGET = "✅ Set total budget to ${:.2f}"
+_MSG_RESIZED_EXISTING = "✅ Resized existing bucket '{}' to {}%"
+_MSG_RESIZE_FAILED = "❌ Failed to resize bucket '{}' - would exceed 100% total"
+_MSG_ADDED_BUCKET = "✅ Added bucket '{}' with {}% allocation"
+_MSG_ADD_BUCKET_FAILED = "❌ Failed to add bucket '{}' - insufficient percentage available"
+_MSG_REMOVED = "✅ Removed bucket '{}'"
+_MSG_REMOVE_FAILED = "❌ Failed to remove bucket '{}' - bucket doesn't exist or is 'free'"
+_MSG_RESIZED = "✅ Resized bucket '{}' to {}%"
+_MSG_CREATED_ADDED = "✅ Created bucket '{}' at 0.00% and added ${:.2f}"
+_MSG_ADDED_AMOUNT = "✅ Added ${:.2f} to bucket '{}'"
+_MSG_ADD_AMOUNT_FAILED = "❌ Failed to add amount to bucket '{}' - bucket doesn't exist"
+_MSG_CREATED_SUBTRACTED = "✅ Created bucket '{}' at 0.00% and subtracted ${:.2f}"
+_MSG_SUBTRACTED_AMOUNT = "✅ Subtracted ${:.2f} from bucket '{}'"
+_MSG_SUBTRACT_AMOUNT_FAILED = "❌ Failed to subtract amount from bucket '{}' - bucket doesn't exist"
+_MSG_AUTO_RESIZED = "✅ Auto-resized all buckets to total 100%"
+_MSG_AUTO_RESIZE_FAILED = "❌ Failed to auto-resize - no buckets exist"
+_MSG_INVALID_ARGUMENT = "❌ Invalid argument: {}"
+_MSG_MISSING_ARGUMENTS = "❌ Missing arguments: {} expects at least {}, got {}"
+
 
 class CommandTranslator:
     """Translates backend commands into BucketManager method calls."""
@@ -38,16 +66,91 @@ class CommandTranslator:
         Returns:
             str: Result message from executing the command
         """
-        commands = command_string.strip().split('\n')
+        # Lines are stripped individually, so the whole string needn't be
+        commands = [
+            command for command in (line.strip() for line in command_string.split('\n'))
+            if command and command != "NO_ACTION"
+        ]
+        ops = [self._parse_amount_op(command) for command in commands]
+        if not any(ops):
+            # Nothing to merge: execute straight through
+            return '\n'.join([self.execute_command(command) for command in commands])
+
         results = []
+        # Consecutive ADD_AMOUNT/SUBTRACT_AMOUNT lines for one bucket, all moving
+        # the same direction, are applied as one net change
+        run: List[_AmountOp] = []
         
-        for command in commands:
-            command = command.strip()
-            if command and command != "NO_ACTION":
-                result = self.execute_command(command)
-                results.append(result)
+        for command, op in zip(commands, ops):
+            if run and (op is None or op[2] != run[0][2] or (op[4] > 0) != (run[0][4] > 0)):
+                results.extend(self._apply_amount_run(run))
+                run = []
+            if op is None:
+                results.append(self.execute_command(command))
+            else:
+                run.append(op)
+        if run:
+            results.extend(self._apply_amount_run(run))
         
         return '\n'.join(results)
+
+    def _parse_amount_op(self, command: str) -> Optional[_AmountOp]:
+        """Parse a well-formed ADD_AMOUNT/SUBTRACT_AMOUNT line with a finite, non-zero amount; None otherwise."""
+        tokens = command.split()
+        if len(tokens) < 3:
+            return None
+        cmd_type = tokens[0] if tokens[0] in _AMOUNT_SIGNS else tokens[0].upper()
+        sign = _AMOUNT_SIGNS.get(cmd_type)
+        if sign is None:
+            return None
+        try:
+            amount = float(tokens[2])
+        except ValueError:
+            return None
+        if amount == 0 or not math.isfinite(amount):
+            return None
+        return command, cmd_type, tokens[1], amount, sign * amount
+
+    def _apply_amount_run(self, run: List[_AmountOp]) -> List[str]:
+        """
+        Apply a run of same-bucket, same-direction amount commands as one net
+        change, returning one result line per command.
+
+        Because every step moves the same way, the net change clamps or
+        breaks the 100% cap exactly when some step in the sequence would
+        (decreasing runs also need the total to start within the cap).
+        Those cases (and a missing bucket) are replayed line by line, so the
+        outcome matches sequential execution up to float rounding.
+        """
+        results = []
+        bucket = self.bucket_manager.get_bucket(run[0][2])
+        if bucket is None:
+            # Let the first line create the bucket with its usual message
+            results.append(self.execute_command(run[0][0]))
+            run = run[1:]
+            bucket = self.bucket_manager.get_bucket(run[0][2]) if run else None
+        if len(run) < 2 or bucket is None:
+            results.extend(self.execute_command(op[0]) for op in run)
+            return results
+
+        manager = self.bucket_manager
+        net = sum(op[4] for op in run)
+        if (
+            manager.total_budget > 0
+            and (net > 0 or manager.get_total_percentage() <= 100.0 + 1e-6)
+            and bucket.percentage * 0.01 * manager.total_budget + net >= 0
+            and manager.add_amount(bucket, net)
+        ):
+            for _, cmd_type, name, amount, _ in run:
+                if cmd_type == 'ADD_AMOUNT':
+                    results.append(_MSG_ADDED_AMOUNT.format(amount, name))
+                else:
+                    results.append(_MSG_SUBTRACTED_AMOUNT.format(amount, name))
+            return results
+
+        # Nothing was applied; fall back to one command at a time
+        results.extend(self.execute_command(op[0]) for op in run)
+        return results
     
     def get_status(self) -> str:
         """Get the current status of the BucketManager as a string."""
@@ -56,7 +159,7 @@ class CommandTranslator:
             "CURRENT BUCKET MANAGER STATUS",
             "="*60,
             str(self.bucket_manager),
-            f"Total percentage: {self.bucket_manager.get_total_percentage():.2f}%",
+            f"Total percentage: {self.bucket_manager.get_total_percentage(exact=True):.2f}%",
             f"Percentage valid: {self.bucket_manager.is_percentage_valid()}",
             "="*60
         ]
@@ -67,15 +170,11 @@ class CommandTranslator:
 
         Returns the uppercased command type and the remaining tokens as args.
         """
-        line = command.strip()
-        if not line:
-            return None
-        tokens = line.split()
+        # split() with no separator already drops surrounding whitespace
+        tokens = command.split()
         if not tokens:
             return None
-        cmd_type = tokens[0].upper()
-        args = tokens[1:]
-        return cmd_type, args
+        return tokens[0].upper(), tokens[1:]
     
     def execute_command(self, command: str) -> str:
         """
@@ -87,106 +186,132 @@ class CommandTranslator:
         Returns:
             str: Result message from executing the command
         """
-        parsed = self.parse_command(command)
-        if not parsed:
+        tokens = command.split()
+        if not tokens:
             return f"Invalid command: {command}"
         
-        cmd_type, args = parsed
+        # The backend prompt emits uppercase keywords, so only pay for
+        # .upper() when the exact spelling misses
+        cmd_type = tokens[0]
+        spec = self._HANDLERS.get(cmd_type)
+        if spec is None:
+            cmd_type = cmd_type.upper()
+            spec = self._HANDLERS.get(cmd_type)
+            if spec is None:
+                return "Unknown command type"
         
+        # Validate and convert arguments up front so handlers get clean
+        # values and only this step needs exception handling
+        handler, min_args, float_positions = spec
+        args: List[Any] = tokens[1:]
+        if len(args) < min_args:
+            return _MSG_MISSING_ARGUMENTS.format(cmd_type, min_args, len(args))
         try:
-            if cmd_type == 'SET_TOTAL_BUDGET':
-                amount = float(args[0])
-                self.bucket_manager.set_total_budget(amount)
-                return f"✅ Set total budget to ${amount:.2f}"
-                
-            elif cmd_type == 'ADD_BUCKET':
-                name = args[0]
-                percentage = float(args[1])
-                current_value = float(args[2]) if len(args) > 2 else 0.0
-                
-                # Check if bucket already exists
-                existing_bucket = self.bucket_manager.get_bucket(name)
-                if existing_bucket is not None:
-                    # Bucket exists, resize it instead
-                    success = self.bucket_manager.resize_bucket(name, percentage)
-                    if success:
-                        return f"✅ Resized existing bucket '{name}' to {percentage}%"
-                    else:
-                        return f"❌ Failed to resize bucket '{name}' - would exceed 100% total"
-                else:
-                    # Bucket doesn't exist, add it
-                    success = self.bucket_manager.add_bucket(name, percentage, current_value)
-                    if success:
-                        return f"✅ Added bucket '{name}' with {percentage}% allocation"
-                    else:
-                        return f"❌ Failed to add bucket '{name}' - insufficient percentage available"
-                    
-            elif cmd_type == 'REMOVE_BUCKET':
-                name = args[0]
-                success = self.bucket_manager.remove_bucket(name)
-                if success:
-                    return f"✅ Removed bucket '{name}'"
-                else:
-                    return f"❌ Failed to remove bucket '{name}' - bucket doesn't exist or is 'free'"
-                    
-            elif cmd_type == 'RESIZE_BUCKET':
-                name = args[0]
-                new_percentage = float(args[1])
-                success = self.bucket_manager.resize_bucket(name, new_percentage)
-                if success:
-                    return f"✅ Resized bucket '{name}' to {new_percentage}%"
-                else:
-                    return f"❌ Failed to resize bucket '{name}' - would exceed 100% total"
-                    
-            elif cmd_type == 'ADD_AMOUNT':
-                name = args[0]
-                amount = float(args[1])
-                # Auto-create bucket at 0.00% if it doesn't exist
-                created = False
-                if self.bucket_manager.get_bucket(name) is None:
-                    # Create with 0% so it's always feasible
-                    self.bucket_manager.add_bucket(name, 0.0)
-                    created = True
-                success = self.bucket_manager.add_amount_to_bucket(name, amount)
-                if success:
-                    if created:
-                        return (
-                            f"✅ Created bucket '{name}' at 0.00% and added ${amount:.2f}"
-                        )
-                    return f"✅ Added ${amount:.2f} to bucket '{name}'"
-                else:
-                    return f"❌ Failed to add amount to bucket '{name}' - bucket doesn't exist"
-                    
-            elif cmd_type == 'SUBTRACT_AMOUNT':
-                name = args[0]
-                amount = float(args[1])
-                # Auto-create bucket at 0.00% if it doesn't exist
-                created = False
-                if self.bucket_manager.get_bucket(name) is None:
-                    self.bucket_manager.add_bucket(name, 0.0)
-                    created = True
-                success = self.bucket_manager.subtract_amount_from_bucket(name, amount)
-                if success:
-                    if created:
-                        return (
-                            f"✅ Created bucket '{name}' at 0.00% and subtracted ${amount:.2f}"
-                        )
-                    return f"✅ Subtracted ${amount:.2f} from bucket '{name}'"
-                else:
-                    return f"❌ Failed to subtract amount from bucket '{name}' - bucket doesn't exist"
-                
-            elif cmd_type == 'AUTO_RESIZE_TO_100':
-                success = self.bucket_manager.auto_resize_to_100_percent()
-                if success:
-                    return "✅ Auto-resized all buckets to total 100%"
-                else:
-                    return "❌ Failed to auto-resize - no buckets exist"
-            
-            return "Unknown command type"
-            
+            for i in float_positions:
+                if i < len(args):
+                    args[i] = float(args[i])
         except ValueError as e:
-            return f"❌ Invalid argument: {e}"
-        except Exception as e:
-            return f"❌ Error executing command: {e}"
-    
+            return _MSG_INVALID_ARGUMENT.format(e)
+        return handler(self, args)
+
+    def _handle_set_total_budget(self, args: List[Any]) -> str:
+        amount = args[0]
+        self.bucket_manager.set_total_budget(amount)
+        return _MSG_SET_BUDGET.format(amount)
+
+    def _handle_add_bucket(self, args: List[Any]) -> str:
+        name = args[0]
+        percentage = args[1]
+        current_value = args[2] if len(args) > 2 else 0.0
+        
+        # Check if bucket already exists
+        existing_bucket = self.bucket_manager.get_bucket(name)
+        if existing_bucket is not None:
+            # Bucket exists, resize it instead
+            success = self.bucket_manager.resize(existing_bucket, percentage)
+            if success:
+                return _MSG_RESIZED_EXISTING.format(name, percentage)
+            else:
+                return _MSG_RESIZE_FAILED.format(name)
+        else:
+            # Bucket doesn't exist, add it
+            success = self.bucket_manager.add_bucket(name, percentage, current_value)
+            if success:
+                return _MSG_ADDED_BUCKET.format(name, percentage)
+            else:
+                return _MSG_ADD_BUCKET_FAILED.format(name)
+
+    def _handle_remove_bucket(self, args: List[Any]) -> str:
+        name = args[0]
+        success = self.bucket_manager.remove_bucket(name)
+        if success:
+            return _MSG_REMOVED.format(name)
+        else:
+            return _MSG_REMOVE_FAILED.format(name)
+
+    def _handle_resize_bucket(self, args: List[Any]) -> str:
+        name = args[0]
+        new_percentage = args[1]
+        try:
+            success = self.bucket_manager.resize_bucket(name, new_percentage)
+        except ValueError as e:
+            # Unknown bucket
+            return _MSG_INVALID_ARGUMENT.format(e)
+        if success:
+            return _MSG_RESIZED.format(name, new_percentage)
+        else:
+            return _MSG_RESIZE_FAILED.format(name)
+
+    def _handle_add_amount(self, args: List[Any]) -> str:
+        name = args[0]
+        amount = args[1]
+        # Auto-create bucket at 0.00% if it doesn't exist
+        bucket, created = self._get_or_create_bucket(name)
+        success = bucket is not None and self.bucket_manager.add_amount(bucket, amount)
+        if success:
+            if created:
+                return _MSG_CREATED_ADDED.format(name, amount)
+            return _MSG_ADDED_AMOUNT.format(amount, name)
+        else:
+            return _MSG_ADD_AMOUNT_FAILED.format(name)
+
+    def _handle_subtract_amount(self, args: List[Any]) -> str:
+        name = args[0]
+        amount = args[1]
+        # Auto-create bucket at 0.00% if it doesn't exist
+        bucket, created = self._get_or_create_bucket(name)
+        success = bucket is not None and self.bucket_manager.add_amount(bucket, -amount)
+        if success:
+            if created:
+                return _MSG_CREATED_SUBTRACTED.format(name, amount)
+            return _MSG_SUBTRACTED_AMOUNT.format(amount, name)
+        else:
+            return _MSG_SUBTRACT_AMOUNT_FAILED.format(name)
+
+    def _get_or_create_bucket(self, name: str) -> Tuple[Optional[Bucket], bool]:
+        """Look a bucket up once, creating it at 0% if missing; returns (bucket, created)."""
+        bucket = self.bucket_manager.get_bucket(name)
+        if bucket is not None:
+            return bucket, False
+        # Create with 0% so it's always feasible
+        self.bucket_manager.add_bucket(name, 0.0)
+        return self.bucket_manager.get_bucket(name), True
+
+    def _handle_auto_resize_to_100(self, args: List[Any]) -> str:
+        success = self.bucket_manager.auto_resize_to_100_percent()
+        if success:
+            return _MSG_AUTO_RESIZED
+        else:
+            return _MSG_AUTO_RESIZE_FAILED
 
+    # Command keyword -> (handler, minimum arg count, positions of numeric args);
+    # one hashed lookup instead of an if/elif ladder. Extra args are ignored.
+    _HANDLERS = {
+        'SET_TOTAL_BUDGET': (_handle_set_total_budget, 1, (0,)),
+        'ADD_BUCKET': (_handle_add_bucket, 2, (1, 2)),
+        'REMOVE_BUCKET': (_handle_remove_bucket, 1, ()),
+        'RESIZE_BUCKET': (_handle_resize_bucket, 2, (1,)),
+        'ADD_AMOUNT': (_handle_add_amount, 2, (1,)),
+        'SUBTRACT_AMOUNT': (_handle_subtract_amount, 2, (1,)),
+        'AUTO_RESIZE_TO_100': (_handle_auto_resize_to_100, 0, ()),
+    }
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.AIM import OpenRouterClient
 from backend.command_translator import CommandTranslator
 
+_PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@lru_cache(maxsize=1)
+def _load_default_prompts() -> Tuple[str, str]:
+    """Read the (frontend, backend) system prompts once per process, with built-in fallbacks."""
+    frontend_path = _PROJECT_DIR / "promptfrontend.txt"
+    backend_path = _PROJECT_DIR / "promptbackend_clean.txt"
+
+    if frontend_path.exists():
+        frontend = frontend_path.read_text(encoding="utf-8").strip()
+    else:
+        frontend = "You are an expert financial advisor for a generation Z adult."
+
+    if backend_path.exists():
+        backend = backend_path.read_text(encoding="utf-8").strip()
+    else:
+        backend = "You are the backend command planner for a budgeting app."
+
+    return frontend, backend
+
 
 class UserClient:
     """High-level session manager for the budgeting app.
@@ -25,30 +47,22 @@ class UserClient:
         # Initialize LLM clients
         self.frontend: OpenRouterClient = OpenRouterClient()
         self.backend: OpenRouterClient = OpenRouterClient()
-        self.command_translator: CommandTranslator = CommandTranslator()
         # Resolve system prompts (fallback to files if not provided)
-        project_dir = Path(__file__).resolve().parents[1]
-        frontend_path = project_dir / "promptfrontend.txt"
-        backend_path = project_dir / "promptbackend_clean.txt"
-
+        default_frontend, default_backend = _load_default_prompts()
         if frontend_system_prompt is None:
-            if frontend_path.exists():
-                frontend_system_prompt = frontend_path.read_text(encoding="utf-8").strip()
-            else:
-                frontend_system_prompt = (
-                    "You are an expert financial advisor for a generation Z adult."
-                )
-
+            frontend_system_prompt = default_frontend
         if backend_system_prompt is None:
-            if backend_path.exists():
-                backend_system_prompt = backend_path.read_text(encoding="utf-8").strip()
-            else:
-                backend_system_prompt = (
-                    "You are the backend command planner for a budgeting app."
-                )
+            backend_system_prompt = default_backend
 
         self.frontend_system_prompt: str = frontend_system_prompt
-        self.backend_system_prompt: str = backend_system_prompt + "\n\n" + self.get_status()
+        # Current bucket status is appended per request (see backend_system_prompt)
+        self._backend_system_base: str = backend_system_prompt
+
+        # Backend request reused across turns; both contents are set per call
+        self._backend_messages: List[Dict[str, Any]] = [
+            {"role": "system", "content": ""},
+            {"role": "user", "content": ""},
+        ]
 
         # Track models per side (allow overrides)
         self.frontend_model: str = frontend_model
@@ -63,11 +77,20 @@ class UserClient:
         self.command_translator: CommandTranslator = CommandTranslator()
         self.bucket_manager = self.command_translator.bucket_manager
 
-    def start_conversation(self) -> str:
-        reply = self.frontend.chat(
-            messages=self.frontend_messages,
-            model=self.frontend_model,
-        )
+    @property
+    def backend_system_prompt(self) -> str:
+        """Backend system prompt followed by the current bucket manager status."""
+        return self._backend_system_base + "\n\n" + self.get_status()
+
+    def start_conversation(self, greeting: Optional[str] = None) -> str:
+        """Open the conversation, reusing `greeting` instead of asking the model when given."""
+        if greeting is not None:
+            reply = greeting
+        else:
+            reply = self.frontend.chat(
+                messages=self.frontend_messages,
+                model=self.frontend_model,
+            )
         self.frontend_messages.append({"role": "assistant", "content": reply})
         return reply
 
@@ -79,13 +102,9 @@ class UserClient:
         )
         self.frontend_messages.append({"role": "assistant", "content": frontend_reply})
 
-        backend_messages: List[Dict[str, Any]] = [
-            {"role": "system", "content": self.backend_system_prompt},
-            {
-                "role": "user",
-                "content": f"USER_REQUEST: {user_text}\nLLM_RESPONSE: {frontend_reply}",
-            },
-        ]
+        backend_messages = self._backend_messages
+        backend_messages[0]["content"] = self.backend_system_prompt
+        backend_messages[1]["content"] = f"USER_REQUEST: {user_text}\nLLM_RESPONSE: {frontend_reply}"
         backend_reply = self.backend.chat(
             messages=backend_messages,
             model=self.backend_model,
@@ -103,9 +122,25 @@ class UserClient:
         return self.command_translator.get_status()
 
     def get_bucket_manager_summary(self) -> str:
-        total_pct = self.bucket_manager.get_total_percentage()
-        total_budget = self.bucket_manager.get_total_budget()
-        bucket_names = ", ".join(sorted(self.bucket_manager.get_bucket_names()))
+        return self._summary_line(
+            self.bucket_manager.get_total_budget(),
+            self.bucket_manager.get_total_percentage(exact=True),
+        )
+
+    def get_full_snapshot(self) -> Dict[str, Any]:
+        """Status text, summary line, BucketManager.snapshot() and the revision it was taken at."""
+        revision = self.bucket_manager.get_revision()
+        snapshot = self.bucket_manager.snapshot()
+        total_budget, total_pct, _ = snapshot
+        return {
+            "status": self.get_status(),
+            "bucket_summary": self._summary_line(total_budget, total_pct),
+            "snapshot": snapshot,
+            "revision": revision,
+        }
+
+    def _summary_line(self, total_budget: float, total_pct: float) -> str:
+        bucket_names = ", ".join(self.bucket_manager.get_sorted_bucket_names())
         return (
             f"Budget=${total_budget:.2f} | Total%={total_pct:.2f} | Buckets=[{bucket_names}]"
         )
@@ -12,11 +12,18 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Repository root, which holds the shared `backend` package. Added once at
+# startup, after the existing entries so it never shadows other imports.
+PROJECT_ROOT = BASE_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
 # Load environment variables from .env file
 load_dotenv(BASE_DIR.parent / '.env')
 
@@ -133,6 +140,24 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# The chat views log per-request detail at DEBUG; keep it off unless asked for.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'chat': {
+            'handlers': ['console'],
+            'level': os.getenv('CHAT_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
+
 # API Keys
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', '')
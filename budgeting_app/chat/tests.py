@@ -1,3 +1,332 @@
-from django.test import TestCase
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from backend.buckets.bucketmanager import BucketManager
+from backend.command_translator import CommandTranslator
+from chat import views
+
+
+class BucketManagerTests(SimpleTestCase):
+    """BucketManager's slot storage, running total and caches."""
+
+    def test_running_total_matches_sum(self):
+        manager = BucketManager(500.0)
+        manager.add_bucket("a", 40.0)
+        manager.add_bucket("b", 35.5)
+        self.assertFalse(manager.add_bucket("c", 30.0))
+        self.assertFalse(manager.resize_bucket("a", 70.0))
+        self.assertEqual(manager.get_bucket("a").percentage, 40.0)
+        self.assertTrue(manager.add_amount_to_bucket("b", 50.0))
+        self.assertTrue(manager.subtract_amount_from_bucket("a", 1000.0))
+        self.assertEqual(manager.get_bucket("a").percentage, 0.0)
+        self.assertTrue(manager.remove_bucket("a"))
+        self.assertAlmostEqual(
+            manager.get_total_percentage(),
+            sum(manager.get_bucket(name).percentage for name in manager.get_bucket_names()),
+        )
+        self.assertAlmostEqual(manager.get_total_percentage(), 45.5)
+        self.assertTrue(manager.remove_bucket("b"))
+        self.assertEqual(manager.get_total_percentage(), 0.0)
+
+    def test_remove_closes_gap_and_keeps_order(self):
+        manager = BucketManager(1000.0)
+        for name, pct in [("rent", 30.0), ("food", 20.0), ("fun", 10.0), ("save", 15.0)]:
+            self.assertTrue(manager.add_bucket(name, pct))
+
+        self.assertTrue(manager.remove_bucket("food"))
+        self.assertFalse(manager.remove_bucket("food"))
+        self.assertEqual(manager.get_bucket_names(), ["rent", "fun", "save"])
+        # Buckets moved down a slot still read and write their own value
+        self.assertTrue(manager.resize_bucket("save", 25.0))
+        self.assertEqual(manager.get_bucket("save").get_percentage(), 25.0)
+        self.assertEqual(manager.get_bucket("fun").percentage, 10.0)
+        self.assertEqual(manager.get_bucket("rent").percentage, 30.0)
+        self.assertAlmostEqual(manager.get_total_percentage(), 65.0)
+
+    def test_capacity_grows_past_initial_slots(self):
+        manager = BucketManager()
+        for i in range(40):
+            self.assertTrue(manager.add_bucket(f"b{i}", 2.5))
+        self.assertEqual(len(manager.get_bucket_names()), 40)
+        self.assertEqual(manager.get_bucket("b0").percentage, 2.5)
+        self.assertEqual(manager.get_bucket("b39").percentage, 2.5)
+        self.assertAlmostEqual(manager.get_total_percentage(), 100.0)
+        self.assertFalse(manager.add_bucket("extra", 1.0))
+
+    def test_auto_resize_without_rent(self):
+        manager = BucketManager()
+        manager.add_bucket("a", 10.0)
+        manager.add_bucket("b", 30.0)
+        self.assertTrue(manager.auto_resize_to_100_percent())
+        self.assertAlmostEqual(manager.get_bucket("a").percentage, 25.0)
+        self.assertAlmostEqual(manager.get_bucket("b").percentage, 75.0)
+        self.assertAlmostEqual(manager.get_total_percentage(), 100.0)
+        self.assertFalse(BucketManager().auto_resize_to_100_percent())
+
+    def test_auto_resize_keeps_rent(self):
+        manager = BucketManager()
+        manager.add_bucket("food", 10.0)
+        manager.add_bucket("rent", 40.0)
+        manager.add_bucket("fun", 30.0)
+        self.assertTrue(manager.auto_resize_to_100_percent())
+        self.assertEqual(manager.get_bucket("rent").percentage, 40.0)
+        self.assertAlmostEqual(manager.get_bucket("food").percentage, 15.0)
+        self.assertAlmostEqual(manager.get_bucket("fun").percentage, 45.0)
+        self.assertAlmostEqual(manager.get_total_percentage(), 100.0)
+
+    def test_add_amount_by_name_or_bucket(self):
+        manager = BucketManager(1000.0)
+        manager.add_bucket("food", 20.0)
+        food = manager.get_bucket("food")
+        self.assertTrue(manager.add_amount(food, 50.0))
+        self.assertTrue(manager.add_amount("food", -100.0))
+        self.assertAlmostEqual(food.percentage, 15.0)
+        self.assertFalse(manager.add_amount("car", 10.0))
+        self.assertFalse(manager.add_amount(food, 2000.0))
+
+        other = BucketManager(1000.0)
+        other.add_bucket("food", 20.0)
+        self.assertFalse(other.add_amount(food, 10.0))
+        manager.remove_bucket("food")
+        self.assertFalse(manager.add_amount(food, 10.0))
+
+    def test_resize_by_name_or_bucket(self):
+        manager = BucketManager()
+        manager.add_bucket("food", 20.0)
+        manager.add_bucket("rent", 30.0)
+        food = manager.get_bucket("food")
+        self.assertTrue(manager.resize(food, 40.0))
+        self.assertTrue(manager.resize("rent", 60.0))
+        self.assertFalse(manager.resize(food, 50.0))
+        self.assertEqual(food.percentage, 40.0)
+        with self.assertRaises(ValueError):
+            manager.resize("car", 1.0)
+        with self.assertRaises(ValueError):
+            BucketManager().resize(food, 1.0)
+
+    def test_sorted_names_follow_adds_and_removes(self):
+        manager = BucketManager()
+        manager.add_bucket("rent", 30.0)
+        manager.add_bucket("food", 20.0)
+        self.assertEqual(manager.get_sorted_bucket_names(), ["food", "rent"])
+        manager.add_bucket("car", 10.0)
+        self.assertEqual(manager.get_sorted_bucket_names(), ["car", "food", "rent"])
+        manager.remove_bucket("food")
+        self.assertEqual(manager.get_sorted_bucket_names(), ["car", "rent"])
+
+    def test_str_tracks_mutations(self):
+        manager = BucketManager(1000.0)
+        manager.add_bucket("food", 20.0)
+        self.assertEqual(
+            str(manager),
+            "BucketManager(total_budget=$1000.00, total_percentage=20.00%):\n"
+            "  Bucket(name='food', percentage=20.00%)",
+        )
+        manager.resize_bucket("food", 25.0)
+        self.assertIn("percentage=25.00%", str(manager))
+        manager.get_bucket("food").resize_percentage(30.0)
+        self.assertIn("percentage=30.00%", str(manager))
+        manager.total_budget = 500.0
+        self.assertIn("total_budget=$500.00", str(manager))
+        manager.remove_bucket("food")
+        self.assertEqual(
+            str(manager), "BucketManager(total_budget=$500.00, total_percentage=0.00%):\n"
+        )
+
+    def test_snapshot(self):
+        manager = BucketManager(1000.0)
+        self.assertEqual(manager.snapshot(), (1000.0, 0.0, ()))
+        manager.add_bucket("food", 20.0)
+        manager.add_bucket("rent", 30.0)
+        manager.set_total_budget(2000.0)
+        self.assertEqual(
+            manager.snapshot(), (2000.0, 50.0, (("food", 20.0), ("rent", 30.0)))
+        )
+
+    def test_revision(self):
+        manager = BucketManager(1000.0)
+        other = BucketManager(1000.0)
+        self.assertNotEqual(manager.get_revision(), other.get_revision())
+
+        revision = manager.get_revision()
+        manager.add_bucket("food", 20.0)
+        self.assertNotEqual(manager.get_revision(), revision)
+
+        revision = manager.get_revision()
+        str(manager)
+        manager.snapshot()
+        manager.get_bucket("food")
+        self.assertEqual(manager.get_revision(), revision)
+
+        manager.get_bucket("food").resize_percentage(25.0)
+        self.assertNotEqual(manager.get_revision(), revision)
+
+        revision = manager.get_revision()
+        manager.set_total_budget(2000.0)
+        self.assertNotEqual(manager.get_revision(), revision)
+
+    def test_displayed_total_is_resummed(self):
+        manager = BucketManager()
+        for name, pct in [("a", 0.1), ("b", 0.3), ("c", 1.1)]:
+            manager.add_bucket(name, pct)
+        for name in ("a", "b", "c"):
+            manager.resize_bucket(name, 0.0)
+        # The running total would drift below zero; the resize re-sums it
+        self.assertEqual(manager.get_total_percentage(), 0.0)
+        self.assertIn("total_percentage=0.00%", str(manager))
+        self.assertEqual(manager.get_total_percentage(exact=True), 0.0)
+        self.assertEqual(manager.snapshot()[1], 0.0)
+
+    def test_reading_the_exact_total_leaves_the_running_total(self):
+        manager = BucketManager()
+        for name, pct in [("a", 0.1), ("b", 0.2), ("c", 0.3)]:
+            manager.add_bucket(name, pct)
+        manager.resize_bucket("a", 0.7)
+        running = manager.get_total_percentage()
+        self.assertNotEqual(running, manager.get_total_percentage(exact=True))
+        str(manager)
+        manager.snapshot()
+        self.assertEqual(manager.get_total_percentage(), running)
+
+
+class CommandTranslatorTests(SimpleTestCase):
+    """Single translator commands."""
+
+    def setUp(self):
+        self.translator = CommandTranslator()
+        self.translator.execute_command("SET_TOTAL_BUDGET 1000")
+        self.translator.execute_command("ADD_BUCKET food 20")
+        self.manager = self.translator.bucket_manager
+
+    def test_amount_commands(self):
+        self.assertEqual(
+            self.translator.execute_command("ADD_AMOUNT food 50"), "✅ Added $50.00 to bucket 'food'"
+        )
+        self.assertAlmostEqual(self.manager.get_bucket("food").percentage, 25.0)
+        self.assertEqual(
+            self.translator.execute_command("SUBTRACT_AMOUNT food 100"),
+            "✅ Subtracted $100.00 from bucket 'food'",
+        )
+        self.assertAlmostEqual(self.manager.get_bucket("food").percentage, 15.0)
+        self.assertEqual(
+            self.translator.execute_command("ADD_AMOUNT car 30"),
+            "✅ Created bucket 'car' at 0.00% and added $30.00",
+        )
+        self.assertAlmostEqual(self.manager.get_bucket("car").percentage, 3.0)
+        self.assertEqual(
+            self.translator.execute_command("SUBTRACT_AMOUNT gym 30"),
+            "✅ Created bucket 'gym' at 0.00% and subtracted $30.00",
+        )
+        self.assertEqual(self.manager.get_bucket("gym").percentage, 0.0)
+        self.assertEqual(
+            self.translator.execute_command("ADD_AMOUNT food 2000"),
+            "❌ Failed to add amount to bucket 'food' - bucket doesn't exist",
+        )
+
+    def test_add_bucket_resizes_existing(self):
+        self.assertEqual(
+            self.translator.execute_command("ADD_BUCKET food 35"),
+            "✅ Resized existing bucket 'food' to 35.0%",
+        )
+        self.assertEqual(self.manager.get_bucket("food").percentage, 35.0)
+        self.assertEqual(
+            self.translator.execute_command("ADD_BUCKET food 120"),
+            "❌ Failed to resize bucket 'food' - would exceed 100% total",
+        )
+        self.assertEqual(self.manager.get_bucket("food").percentage, 35.0)
+
+
+class CommandTranslatorAmountRunTests(SimpleTestCase):
+    """Merged ADD_AMOUNT/SUBTRACT_AMOUNT runs must behave like one line at a time."""
+
+    SETUP = [
+        "SET_TOTAL_BUDGET 1000",
+        "ADD_BUCKET food 20",
+        "ADD_BUCKET rent 30",
+    ]
+
+    def assertMatchesSequential(self, lines, setup=SETUP):
+        merged = CommandTranslator()
+        merged("\n".join(setup))
+        merged_results = merged("\n".join(lines)).split("\n")
+
+        sequential = CommandTranslator()
+        for line in setup:
+            sequential.execute_command(line)
+        sequential_results = [sequential.execute_command(line) for line in lines]
+
+        self.assertEqual(merged_results, sequential_results)
+        merged_manager = merged.bucket_manager
+        sequential_manager = sequential.bucket_manager
+        self.assertEqual(merged_manager.get_bucket_names(), sequential_manager.get_bucket_names())
+        for name in sequential_manager.get_bucket_names():
+            self.assertAlmostEqual(
+                merged_manager.get_bucket(name).percentage,
+                sequential_manager.get_bucket(name).percentage,
+                msg=name,
+            )
+        self.assertAlmostEqual(
+            merged_manager.get_total_percentage(), sequential_manager.get_total_percentage()
+        )
+
+    def test_add_run(self):
+        self.assertMatchesSequential(["ADD_AMOUNT food 50", "ADD_AMOUNT food 25.5", "ADD_AMOUNT food 10"])
+
+    def test_subtract_run(self):
+        self.assertMatchesSequential(["SUBTRACT_AMOUNT food 50", "SUBTRACT_AMOUNT food 30"])
+
+    def test_subtract_run_clamps_at_zero(self):
+        self.assertMatchesSequential(
+            ["SUBTRACT_AMOUNT food 150", "SUBTRACT_AMOUNT food 100", "ADD_AMOUNT food 10"]
+        )
+
+    def test_add_run_stops_at_cap(self):
+        self.assertMatchesSequential(
+            ["ADD_AMOUNT food 300", "ADD_AMOUNT food 300", "ADD_AMOUNT food 100"]
+        )
+
+    def test_missing_bucket(self):
+        self.assertMatchesSequential(["ADD_AMOUNT car 50", "ADD_AMOUNT car 20"])
+        self.assertMatchesSequential(["SUBTRACT_AMOUNT car 10", "SUBTRACT_AMOUNT car 10"])
+
+    def test_mixed_directions_and_buckets(self):
+        self.assertMatchesSequential([
+            "ADD_AMOUNT food 50",
+            "SUBTRACT_AMOUNT food 20",
+            "ADD_AMOUNT food 10",
+            "ADD_AMOUNT rent 5",
+            "add_amount rent 5",
+            "RESIZE_BUCKET food 10",
+            "SUBTRACT_AMOUNT rent 400",
+            "SUBTRACT_AMOUNT rent 1",
+        ])
+        # Netting these would hide the clamp at $0 and the rejected step past 100%
+        self.assertMatchesSequential(["SUBTRACT_AMOUNT food 300", "ADD_AMOUNT food 100"])
+        self.assertMatchesSequential(["ADD_AMOUNT food 600", "SUBTRACT_AMOUNT food 100"])
+
+    def test_zero_and_malformed_amounts(self):
+        self.assertMatchesSequential([
+            "ADD_AMOUNT food 0",
+            "ADD_AMOUNT food 10",
+            "ADD_AMOUNT food abc",
+            "ADD_AMOUNT food",
+            "ADD_AMOUNT food 10",
+        ])
+
+    def test_without_budget(self):
+        self.assertMatchesSequential(
+            ["ADD_AMOUNT food 10", "ADD_AMOUNT food 10"], setup=["ADD_BUCKET food 20"]
+        )
+
+
+class UtcTimestampTests(SimpleTestCase):
+    """_utc_timestamp() against datetime.isoformat()."""
+
+    def test_matches_isoformat(self):
+        for now in (1700000000.0, 1700000000.25, 1700000001.000001, 1700000001.9999999):
+            with mock.patch.object(views.time, "time", return_value=now):
+                timestamp = views._utc_timestamp()
+            expected = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+            self.assertEqual(timestamp, expected)
@@ -1,90 +1,282 @@
-import json
-import sys
+import atexit
+import hashlib
+import logging
+import logging.handlers
 import os
-from pathlib import Path
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-# Add the parent directory to sys.path to import backend modules
-project_root = Path(__file__).resolve().parents[2]
-sys.path.insert(0, str(project_root))
-
 from backend.user_client import UserClient
 from backend.buckets.bucket import Bucket
 from backend.AIM import OpenRouterClient
 
+logger = logging.getLogger(__name__)
 
-def log_system_context(user_client, enhanced_user_message, response):
-    """Append system context details to a log file under project logs directory."""
-    try:
-        logs_dir = project_root / "logs"
-        logs_dir.mkdir(parents=True, exist_ok=True)
-        log_path = logs_dir / "system_context.log"
 
-        timestamp = datetime.utcnow().isoformat()
-        sections = [
-            f"[{timestamp} UTC]",
-            
-            "-- Enhanced User Message--",
-            enhanced_user_message,
-            "Frontend Response:",
-            response['frontend'],
-            "=== BUCKET MANAGER STATUS ===",
-            user_client.get_status(),
-            "Backend Response:",
-            response['backend'],
-            "",
-        ]
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write("\n".join(sections) + "\n")
+# System context records are written behind the request by a daemon thread
+_LOG_PATH = settings.PROJECT_ROOT / "logs" / "system_context.log"
+# SimpleQueue puts never take a lock; the size cap is enforced (approximately)
+# by log_system_context checking qsize() instead
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_QUEUE_MAX = 1024
+_LOG_BATCH_SIZE = 128
+_log_writer = None
+_log_writer_lock = threading.Lock()
+# Queued at exit to tell the writer thread to finish up and return
+_LOG_STOP = object()
+_LOG_FLUSH_TIMEOUT = 5.0
+# The file rolls over to system_context.log.1 .. .5 once it reaches 50 MB
+_LOG_MAX_BYTES = 50 * 1024 * 1024
+_LOG_BACKUP_COUNT = 5
+_log_handler = None
+
+
+def _drain_log_queue(batch, limit):
+    """Move up to limit queued records into batch without blocking."""
+    while len(batch) < limit:
+        try:
+            batch.append(_LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _write_log_batch(batch):
+    """Append a batch as one write through a rotating handler, created on first use."""
+    global _log_handler
+    if _log_handler is None:
+        os.makedirs(_LOG_PATH.parent, exist_ok=True)
+        _log_handler = logging.handlers.RotatingFileHandler(
+            _LOG_PATH,
+            maxBytes=_LOG_MAX_BYTES,
+            backupCount=_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        # Records already end in a blank line
+        _log_handler.terminator = ""
+    _log_handler.handle(logging.makeLogRecord({"msg": "".join(batch)}))
+
+
+def _log_writer_loop():
+    while True:
+        batch = _drain_log_queue([_LOG_QUEUE.get()], _LOG_BATCH_SIZE)
+        stop = any(record is _LOG_STOP for record in batch)
+        if stop:
+            batch = [record for record in batch if record is not _LOG_STOP]
+        if batch:
+            try:
+                _write_log_batch(batch)
+            except Exception as e:
+                logger.warning("Failed to write system context log: %s", e)
+        if stop:
+            return
+
+
+def _ensure_log_writer():
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(
+                    target=_log_writer_loop, name="system-context-log", daemon=True
+                )
+                _log_writer.start()
+
+
+@atexit.register
+def _flush_log_queue():
+    """Let the writer thread finish the queue, then write any stragglers (best effort)."""
+    writer = _log_writer
+    if writer is not None and writer.is_alive():
+        _LOG_QUEUE.put(_LOG_STOP)
+        writer.join(_LOG_FLUSH_TIMEOUT)
+        if writer.is_alive():
+            # Writing here as well could interleave with the thread's batch
+            return
+    batch = _drain_log_queue([], _LOG_QUEUE_MAX)
+    if batch:
+        _write_log_batch(batch)
+
+
+# (whole second, formatted "YYYY-MM-DDTHH:MM:SS") of the last log timestamp
+_timestamp_cache = (None, "")
+
+
+def _utc_timestamp():
+    """Current UTC time in ISO format, reformatting the date part at most once a second."""
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    # Round the fraction the way datetime.fromtimestamp() does
+    micros = round((now - second) * 1e6)
+    if micros == 1000000:
+        second += 1
+        micros = 0
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, prefix)
+    # Like isoformat(), omit the fraction when it is exactly zero
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+
+# One record per chat turn; the static section headers are baked in once here
+_LOG_RECORD_TEMPLATE = (
+    "[{timestamp} UTC]\n"
+    "-- Enhanced User Message--\n"
+    "{message}\n"
+    "Frontend Response:\n"
+    "{frontend}\n"
+    "=== BUCKET MANAGER STATUS ===\n"
+    "{status}\n"
+    "Backend Response:\n"
+    "{backend}\n"
+    "\n"
+)
+
+
+def log_system_context(user_client, enhanced_user_message, response, status=None):
+    """Queue system context details for the log file under project logs directory.
+
+    Pass status when the caller already has user_client.get_status() in hand.
+
+    Never blocks the request: the record is dropped if the writer has fallen
+    too far behind.
+    """
+    if _LOG_QUEUE.qsize() >= _LOG_QUEUE_MAX:
+        logger.warning("System context log queue full; dropping record")
+        return
+    try:
+        record = _LOG_RECORD_TEMPLATE.format(
+            timestamp=_utc_timestamp(),
+            message=enhanced_user_message,
+            frontend=response['frontend'],
+            status=status if status is not None else user_client.get_status(),
+            backend=response['backend'],
+        )
+        _ensure_log_writer()
+        _LOG_QUEUE.put_nowait(record)
     except Exception as e:
-        print(f"[WARN] Failed to write system context log: {e}")
+        logger.warning("Failed to write system context log: %s", e)
+
+
+@dataclass
+class BucketDatum:
+    """One bucket row of the chart payload; orjson serializes it as a dict"""
+    __slots__ = ('name', 'current', 'max', 'percentage')
+    name: str
+    current: float
+    max: float
+    percentage: float
 
 
-def get_detailed_bucket_data(bucket_manager):
-    """Extract detailed bucket information for chart visualization"""
+@dataclass
+class Recommendation:
+    """One normalized AI recommendation; orjson serializes it as a dict"""
+    __slots__ = ('id', 'text', 'action_text', 'category', 'priority')
+    id: str
+    text: str
+    action_text: str
+    category: str
+    priority: str
+
+
+# (bucket manager revision, result) of the last get_detailed_bucket_data call
+_bucket_data_cache = (None, None)
+
+
+_EMPTY_CHART_CONTEXT = "\n\nCURRENT CHART STATE: No budget buckets have been created yet. The chart shows 100% unallocated."
+_CHART_CONTEXT_TEMPLATE = (
+    "\n\nCURRENT CHART STATE: Your budget is visualized with {count} buckets. "
+    "Total budget: ${budget:.2f}, "
+    "Total allocated: {total:.1f}%. "
+    "Buckets: {buckets}"
+)
+# (bucket manager revision, text) of the last build_chart_context call
+_chart_context_cache = (None, None)
+
+
+def build_chart_context(bucket_manager):
+    """Describe the current chart state for the AI, straight from the bucket manager"""
+    global _chart_context_cache
+    revision = bucket_manager.get_revision()
+    cached_revision, cached_text = _chart_context_cache
+    if cached_revision == revision:
+        return cached_text
+    total_budget, total_percentage, items = bucket_manager.snapshot()
+    if not items:
+        chart_context = _EMPTY_CHART_CONTEXT
+    else:
+        chart_context = _CHART_CONTEXT_TEMPLATE.format(
+            count=len(items),
+            budget=total_budget,
+            total=total_percentage,
+            buckets=", ".join([f"{name} ({pct:.1f}%)" for name, pct in items]),
+        )
+    _chart_context_cache = (revision, chart_context)
+    return chart_context
+
+
+def get_detailed_bucket_data(bucket_manager, snapshot=None, revision=None):
+    """Extract detailed bucket information for chart visualization.
+
+    Pass snapshot, with the revision read before it, when the caller already
+    holds them (see UserClient.get_full_snapshot()).
+    The result is reused until the bucket state changes; callers must not mutate it.
+    """
+    global _bucket_data_cache
     try:
-        bucket_names = bucket_manager.get_bucket_names()
-        bucket_data = []
-        total_budget = bucket_manager.get_total_budget()
-        print(f"[DEBUG] get_detailed_bucket_data - Raw bucket names: {bucket_names}")
+        if snapshot is None or revision is None:
+            revision = bucket_manager.get_revision()
+            snapshot = None
+        cached_revision, cached_data = _bucket_data_cache
+        if cached_revision == revision:
+            return cached_data
+        if snapshot is None:
+            snapshot = bucket_manager.snapshot()
         
-        for name in bucket_names:
-            bucket = bucket_manager.get_bucket(name)
-            if bucket:
-                # Include all defined buckets; unallocated is implicit (100 - allocated)
-                current_amount = total_budget * (bucket.get_percentage() / 100.0)
-                bucket_info = {
-                    'name': name,
-                    'current': current_amount,
-                    'max': total_budget * (bucket.get_percentage() / 100.0),
-                    'percentage': bucket.get_percentage()
-                }
-                bucket_data.append(bucket_info)
-                print(f"[DEBUG] Added bucket to chart data: {bucket_info}")
+        total_budget, total_percentage, items = snapshot
+        bucket_data = []
         
-        # Get actual total budget and percentage
-        total_percentage = bucket_manager.get_total_percentage()
+        # Include all defined buckets; unallocated is implicit (100 - allocated)
+        for name, percentage in items:
+            current_amount = (percentage / 100.0) * total_budget
+            bucket_data.append(BucketDatum(name, current_amount, current_amount, percentage))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("get_detailed_bucket_data - Raw bucket names: %s", [name for name, _ in items])
+            for bucket_info in bucket_data:
+                logger.debug("Added bucket to chart data: %s", bucket_info)
         
-        # Debug info
-        debug_info = {
-            'bucket_manager_str': str(bucket_manager),
-            'raw_bucket_names': bucket_names,
-            'filtered_bucket_count': len(bucket_data),
-            'total_budget': total_budget,
-            'total_percentage': total_percentage,
-            'buckets_detail': [f"{b['name']}: {b['percentage']:.1f}% (${b['current']:.2f})" for b in bucket_data]
-        }
-        
-        return {
+        result = {
             'buckets': bucket_data,
             'total_budget': total_budget,
             'total_percentage': total_percentage,
-            'debug': debug_info
         }
+        # Debug info (development only; the frontend just logs it when present)
+        if settings.DEBUG:
+            result['debug'] = {
+                'bucket_manager_str': str(bucket_manager),
+                'raw_bucket_names': [name for name, _ in items],
+                'filtered_bucket_count': len(bucket_data),
+                'total_budget': total_budget,
+                'total_percentage': total_percentage,
+                'buckets_detail': [f"{b.name}: {b.percentage:.1f}% (${b.current:.2f})" for b in bucket_data]
+            }
+        _bucket_data_cache = (revision, result)
+        return result
     except Exception as e:
         return {
             'buckets': [],
@@ -94,15 +286,135 @@ def get_detailed_bucket_data(bucket_manager):
         }
 
 
-def generate_backend_recommendations(user_message, ai_response, bucket_data):
+# Fixed part of the recommendation request; read-only, shared by every call
+_RECOMMENDATION_SYSTEM_MESSAGES = (
+    {
+        "role": "system",
+        "content": (
+            "You are a budgeting strategist. Generate exactly three practical suggestions to either "
+            "(a) move percentage allocations between existing buckets, or (b) add a new bucket with a suggested percentage. "
+            "Consider unallocated space and keep total allocation within 100%. If suggesting moves, ensure amounts are feasible. "
+            "Keep each suggestion short and clear."
+        ),
+    },
+    {
+        "role": "system",
+        "content": (
+            "Respond in strict JSON with a top-level object containing a 'recommendations' array. "
+            "Each item must include: id (string), text (string), action_text (string), category (string), priority (one of: high, medium, low). "
+            "Text should be a brief title; action_text should be a user-clickable command phrased as a request. "
+            "Do not include markdown or prose outside the JSON."
+        ),
+    },
+)
+_VALID_PRIORITIES = frozenset({"high", "medium", "low"})
+_recommendation_client = None
+
+
+def _get_recommendation_client():
+    """One OpenRouterClient for all recommendation calls (created on first use)."""
+    global _recommendation_client
+    if _recommendation_client is None:
+        _recommendation_client = OpenRouterClient()
+    return _recommendation_client
+
+
+# Recommendations for the same turn against the same allocation are reused for an hour
+_RECOMMENDATION_CACHE_TTL = 3600
+
+# Shown instead of calling the model while there is no budget and no bucket yet
+_STARTER_RECOMMENDATIONS = (
+    Recommendation(
+        "set_total_budget", "Set your total monthly budget",
+        "Help me set my total monthly budget", "Budget Setup", "high",
+    ),
+    Recommendation(
+        "add_first_bucket", "Create your first budget bucket",
+        "Help me create my first budget bucket", "Budget Setup", "high",
+    ),
+    Recommendation(
+        "review_categories", "Review common spending categories",
+        "What spending categories should I budget for?", "Budget Planning", "medium",
+    ),
+)
+
+# Messages shorter than this ("ok", "thanks") reuse the last recommendations
+# made for the same bucket manager revision instead of asking the model again
+_FILLER_MESSAGE_CHARS = 20
+_RECENT_RECOMMENDATIONS_SIZE = 1024
+_recent_recommendations = OrderedDict()
+_recent_recommendations_lock = threading.Lock()
+
+
+def _remember_recommendations(revision, recommendations):
+    with _recent_recommendations_lock:
+        _recent_recommendations[revision] = recommendations
+        _recent_recommendations.move_to_end(revision)
+        if len(_recent_recommendations) > _RECENT_RECOMMENDATIONS_SIZE:
+            _recent_recommendations.popitem(last=False)
+
+
+def _recommendation_cache_key(user_message, ai_response, bucket_data):
+    """Cache key for one turn: the normalized texts plus the allocation rounded to 0.1%"""
+    payload = (
+        (user_message or "").strip().lower(),
+        ai_response or "",
+        round(bucket_data.get("total_budget", 0), 2),
+        sorted((b.name, round(b.percentage, 1)) for b in bucket_data.get("buckets", [])),
+    )
+    return "chat:recommendations:" + hashlib.sha256(orjson.dumps(payload)).hexdigest()
+
+
+def _normalize_recommendations(data):
+    """Turn a parsed model reply (object with a 'recommendations' array, or a bare
+    array) into at most three Recommendation items, filling in missing fields."""
+    items = []
+    if isinstance(data, dict) and isinstance(data.get("recommendations"), list):
+        items = data["recommendations"]
+    elif isinstance(data, list):
+        items = data
+
+    normalized = []
+    for idx, item in enumerate(items[:3]):
+        if not isinstance(item, dict):
+            continue
+        rec_id = str(item.get("id") or f"ai_rec_{idx+1}")
+        text = str(item.get("text") or "Budget suggestion")
+        action_text = str(item.get("action_text") or text)
+        category = str(item.get("category") or "Budget Optimization")
+        priority = str(item.get("priority") or "medium").lower()
+        if priority not in _VALID_PRIORITIES:
+            priority = "medium"
+        normalized.append(Recommendation(rec_id, text, action_text, category, priority))
+    return normalized
+
+
+def generate_backend_recommendations(user_message, ai_response, bucket_data, revision=None):
     """Use an AI model to generate three actionable budget recommendations.
 
     The suggestions should focus on reallocating percentages between existing buckets
     or proposing new buckets, while respecting that total allocation must not exceed 100%.
-    Returns a list of up to three items with keys: id, text, action_text, category, priority.
+    Returns a list of up to three Recommendation items (id, text, action_text, category, priority).
+    Non-empty results are cached per turn and allocation (see _recommendation_cache_key).
+    An empty budget gets fixed starter suggestions, and when revision (the bucket
+    manager's revision) is given, short filler messages reuse the last result for it.
     """
     try:
         safe_bucket_data = bucket_data or {}
+        if not safe_bucket_data.get("buckets") and not safe_bucket_data.get("total_budget"):
+            return list(_STARTER_RECOMMENDATIONS)
+        if revision is not None and len((user_message or "").strip()) < _FILLER_MESSAGE_CHARS:
+            recent = _recent_recommendations.get(revision)
+            if recent is not None:
+                return recent
+
+        cache_key = _recommendation_cache_key(user_message, ai_response, safe_bucket_data)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if revision is not None:
+                _remember_recommendations(revision, cached)
+            return cached
+
         context = {
             "user_message": user_message or "",
             "ai_response": ai_response or "",
@@ -110,92 +422,150 @@ def generate_backend_recommendations(user_message, ai_response, bucket_data):
                 "total_budget": safe_bucket_data.get("total_budget", 0),
                 "total_percentage": safe_bucket_data.get("total_percentage", 0),
                 "buckets": [
-                    {
-                        "name": b.get("name", ""),
-                        "percentage": float(b.get("percentage", 0)),
-                    }
+                    {"name": b.name, "percentage": float(b.percentage)}
                     for b in safe_bucket_data.get("buckets", [])
                 ],
             },
         }
 
-        system_prompt = (
-            "You are a budgeting strategist. Generate exactly three practical suggestions to either "
-            "(a) move percentage allocations between existing buckets, or (b) add a new bucket with a suggested percentage. "
-            "Consider unallocated space and keep total allocation within 100%. If suggesting moves, ensure amounts are feasible. "
-            "Keep each suggestion short and clear."
-        )
-
-        schema_instructions = (
-            "Respond in strict JSON with a top-level object containing a 'recommendations' array. "
-            "Each item must include: id (string), text (string), action_text (string), category (string), priority (one of: high, medium, low). "
-            "Text should be a brief title; action_text should be a user-clickable command phrased as a request. "
-            "Do not include markdown or prose outside the JSON."
-        )
-
-        client = OpenRouterClient()
+        client = _get_recommendation_client()
         raw = client.chat(
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "system", "content": schema_instructions},
-                {"role": "user", "content": json.dumps({"context": context})},
+                *_RECOMMENDATION_SYSTEM_MESSAGES,
+                {"role": "user", "content": orjson.dumps({"context": context}).decode()},
             ],
             json_mode=True,
             temperature=0.6,
             max_tokens=600,
         )
 
-        data = json.loads(raw) if isinstance(raw, str) else (raw or {})
-        items = []
-        if isinstance(data, dict) and isinstance(data.get("recommendations"), list):
-            items = data["recommendations"]
-        elif isinstance(data, list):
-            items = data
-
-        normalized = []
-        for idx, item in enumerate(items[:3]):
-            if not isinstance(item, dict):
-                continue
-            rec_id = str(item.get("id") or f"ai_rec_{idx+1}")
-            text = str(item.get("text") or "Budget suggestion")
-            action_text = str(item.get("action_text") or text)
-            category = str(item.get("category") or "Budget Optimization")
-            priority = str(item.get("priority") or "medium").lower()
-            if priority not in {"high", "medium", "low"}:
-                priority = "medium"
-            normalized.append({
-                "id": rec_id,
-                "text": text,
-                "action_text": action_text,
-                "category": category,
-                "priority": priority,
-            })
-
-        return normalized[:3]
+        data = orjson.loads(raw) if isinstance(raw, str) else (raw or {})
+        normalized = _normalize_recommendations(data)
+        if normalized:
+            cache.set(cache_key, normalized, _RECOMMENDATION_CACHE_TTL)
+            if revision is not None:
+                _remember_recommendations(revision, normalized)
+        return normalized
 
     except Exception as e:
-        print(f"[WARN] AI recommendation generation failed: {e}")
+        logger.warning("AI recommendation generation failed: %s", e)
         return []
 
 
+# Opening greeting per (frontend system prompt, frontend model); the prompt is
+# fixed per deployment, so one model call serves every new conversation
+_GREETING_CACHE = {}
+_greeting_lock = threading.Lock()
+
+
+def get_greeting(user_client):
+    """Start the user client's conversation with the cached greeting, generating it once."""
+    key = (user_client.frontend_system_prompt, user_client.frontend_model)
+    greeting = _GREETING_CACHE.get(key)
+    if greeting is None:
+        with _greeting_lock:
+            greeting = _GREETING_CACHE.get(key)
+            if greeting is None:
+                greeting = user_client.start_conversation()
+                _GREETING_CACHE[key] = greeting
+                return greeting
+    return user_client.start_conversation(greeting)
+
+
 class ChatSession:
-    """Simple session management for chat interface"""
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ChatSession, cls).__new__(cls)
-            cls._instance.user_client = None
-            print("[DEBUG] Created new ChatSession instance")
-        return cls._instance
-    
-    def get_user_client(self):
-        if self.user_client is None:
-            self.user_client = UserClient()
-            print("[DEBUG] Created new UserClient instance")
-        else:
-            print("[DEBUG] Reusing existing UserClient instance")
-        return self.user_client
+    """Per-browser-session UserClients for the chat interface (use the CHAT_SESSION instance).
+
+    Clients are keyed by the Django session key. A client idle for longer than
+    idle_timeout seconds is dropped (every use restarts its clock), as is the
+    least recently used one once max_clients is exceeded. Requests without a
+    session (no SessionMiddleware) share one client.
+    """
+
+    max_clients = 10000
+    idle_timeout = 30 * 60
+
+    def __init__(self):
+        # session key -> (UserClient, last use), least recently used first
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _session_key(request):
+        session = getattr(request, "session", None)
+        if session is None:
+            return ""
+        if session.session_key is None:
+            session.save()
+        return session.session_key
+
+    def get_user_client(self, request):
+        key = self._session_key(request)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                user_client = entry[0]
+                self._clients[key] = (user_client, now)
+                self._clients.move_to_end(key)
+                return user_client
+            user_client = self._store(key, UserClient(), now)
+        logger.debug("Created new UserClient instance")
+        return user_client
+
+    def reset_user_client(self, request):
+        """Replace the request's client with a fresh one and return it."""
+        key = self._session_key(request)
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            return self._store(key, UserClient(), now)
+
+    def _expire(self, now):
+        # Entries are in last-use order, so the idle ones are all at the front
+        clients = self._clients
+        cutoff = now - self.idle_timeout
+        while clients:
+            key, (_, last_used) = next(iter(clients.items()))
+            if last_used > cutoff:
+                break
+            del clients[key]
+
+    def _store(self, key, user_client, now):
+        clients = self._clients
+        clients[key] = (user_client, now)
+        clients.move_to_end(key)
+        while len(clients) > self.max_clients:
+            clients.popitem(last=False)
+        return user_client
+
+
+# Shared by every view; holds one UserClient per session
+CHAT_SESSION = ChatSession()
+
+
+def fast_json_response(data, status=200):
+    """JSON response serialized with orjson (compact output, native float formatting)
+
+    NumPy arrays and scalars are written directly, without a .tolist() first.
+    """
+    return HttpResponse(
+        orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY),
+        content_type='application/json',
+        status=status,
+    )
+
+
+# Static error bodies, serialized once
+_EMPTY_MESSAGE_BODY = orjson.dumps({'success': False, 'error': 'Message cannot be empty'})
+_INVALID_JSON_BODY = orjson.dumps({'success': False, 'error': 'Invalid JSON data'})
+
+# Longest chat message accepted; anything longer is rejected before the model round-trip
+_MAX_MESSAGE_CHARS = 4000
+_MESSAGE_TOO_LONG_BODY = orjson.dumps({
+    'success': False,
+    'error': f'Message cannot be longer than {_MAX_MESSAGE_CHARS} characters',
+})
 
 
 def index(request):
@@ -208,20 +578,19 @@ def index(request):
 def start_conversation(request):
     """Initialize a new conversation"""
     try:
-        session = ChatSession()
         # Reset the user client for a fresh conversation
-        session.user_client = UserClient()
+        user_client = CHAT_SESSION.reset_user_client(request)
         
         # Get the initial greeting
-        greeting = session.get_user_client().start_conversation()
+        greeting = get_greeting(user_client)
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'message': greeting,
             'type': 'greeting'
         })
     except Exception as e:
-        return JsonResponse({
+        return fast_json_response({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -232,61 +601,49 @@ def start_conversation(request):
 def send_message(request):
     """Process user message and return AI response"""
     try:
-        data = json.loads(request.body)
-        user_message = data.get('message', '').strip()
+        data = orjson.loads(request.body)
+        user_message = (data.get('message') or '').strip()
         
         if not user_message:
-            return JsonResponse({
-                'success': False,
-                'error': 'Message cannot be empty'
-            }, status=400)
+            return HttpResponse(_EMPTY_MESSAGE_BODY, content_type='application/json', status=400)
+        if len(user_message) > _MAX_MESSAGE_CHARS:
+            return HttpResponse(_MESSAGE_TOO_LONG_BODY, content_type='application/json', status=400)
         
-        session = ChatSession()
-        user_client = session.get_user_client()
+        user_client = CHAT_SESSION.get_user_client(request)
         
-        # Get current bucket state for AI context
-        bucket_data = get_detailed_bucket_data(user_client.bucket_manager)
-        
-        # Add chart context to the user message
-        chart_context = ""
-        if bucket_data['buckets']:
-            chart_context = f"\n\nCURRENT CHART STATE: Your budget is visualized with {len(bucket_data['buckets'])} buckets. "
-            chart_context += f"Total budget: ${bucket_data['total_budget']:.2f}, "
-            chart_context += f"Total allocated: {bucket_data['total_percentage']:.1f}%. "
-            chart_context += "Buckets: " + ", ".join([f"{b['name']} ({b['percentage']:.1f}%)" for b in bucket_data['buckets']])
-        else:
-            chart_context = "\n\nCURRENT CHART STATE: No budget buckets have been created yet. The chart shows 100% unallocated."
+        # Add current chart context to the user message
+        chart_context = build_chart_context(user_client.bucket_manager)
         
         # Process the user input with chart context
         enhanced_user_message = user_message + chart_context
         response = user_client.process_user_input(enhanced_user_message)
         
         # Debug: Log what commands were executed
-        print(f"[DEBUG] User Message: {user_message}")
-        print(f"[DEBUG] Frontend Response: {response['frontend']}")
-        print(f"[DEBUG] Backend Commands: {response['backend']}")
-        print(f"[DEBUG] Command Results: {response['commands']}")
+        logger.debug("User Message: %s", user_message)
+        logger.debug("Frontend Response: %s", response['frontend'])
+        logger.debug("Backend Commands: %s", response['backend'])
+        logger.debug("Command Results: %s", response['commands'])
         
-        # Get bucket status for visualization
-        status = user_client.get_status()
-        bucket_summary = user_client.get_bucket_manager_summary()
-        
-        # Get updated detailed bucket information for charts (after AI processing)
-        updated_bucket_data = get_detailed_bucket_data(user_client.bucket_manager)
-        print(f"[DEBUG] Updated bucket data: {updated_bucket_data}")
+        # Get bucket status and detailed chart data (after AI processing)
+        snap = user_client.get_full_snapshot()
+        status = snap['status']
+        bucket_summary = snap['bucket_summary']
+        updated_bucket_data = get_detailed_bucket_data(user_client.bucket_manager, snap['snapshot'], snap['revision'])
+        logger.debug("Updated bucket data: %s", updated_bucket_data)
         
         # Generate smart recommendations based on the interaction
         backend_recommendations = generate_backend_recommendations(
             user_message, 
             response['frontend'], 
-            updated_bucket_data
+            updated_bucket_data,
+            snap['revision'],
         )
-        # Log system context before invoking the model
+        # Queue the system context record; the log writer thread does the file I/O
         try:
-            log_system_context(user_client, enhanced_user_message, response)
+            log_system_context(user_client, enhanced_user_message, response, status)
         except Exception as e:
-            print(f"[WARN] system context logging failed: {e}")
-        return JsonResponse({
+            logger.warning("system context logging failed: %s", e)
+        return fast_json_response({
             'success': True,
             'frontend_response': response['frontend'],
             'backend_response': response['backend'],
@@ -298,13 +655,10 @@ def send_message(request):
             'type': 'response'
         })
         
-    except json.JSONDecodeError:
-        return JsonResponse({
-            'success': False,
-            'error': 'Invalid JSON data'
-        }, status=400)
+    except orjson.JSONDecodeError:
+        return HttpResponse(_INVALID_JSON_BODY, content_type='application/json', status=400)
     except Exception as e:
-        return JsonResponse({
+        return fast_json_response({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -315,14 +669,14 @@ def send_message(request):
 def get_status(request):
     """Get current bucket status and summary"""
     try:
-        session = ChatSession()
-        user_client = session.get_user_client()
+        user_client = CHAT_SESSION.get_user_client(request)
         
-        status = user_client.get_status()
-        bucket_summary = user_client.get_bucket_manager_summary()
-        bucket_data = get_detailed_bucket_data(user_client.bucket_manager)
+        snap = user_client.get_full_snapshot()
+        status = snap['status']
+        bucket_summary = snap['bucket_summary']
+        bucket_data = get_detailed_bucket_data(user_client.bucket_manager, snap['snapshot'], snap['revision'])
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'status': status,
             'bucket_summary': bucket_summary,
@@ -330,7 +684,7 @@ def get_status(request):
         })
         
     except Exception as e:
-        return JsonResponse({
+        return fast_json_response({
             'success': False,
             'error': str(e)
         }, status=500)
@@ -341,8 +695,7 @@ def get_status(request):
 def test_bucket_operations(request):
     """Test bucket operations directly"""
     try:
-        session = ChatSession()
-        user_client = session.get_user_client()
+        user_client = CHAT_SESSION.get_user_client(request)
         
         if request.method == "POST":
             # Execute test operations
@@ -356,11 +709,12 @@ def test_bucket_operations(request):
             result_msg = "GET request - ready to test"
         
         # Get current state
-        bucket_data = get_detailed_bucket_data(user_client.bucket_manager)
-        status = user_client.get_status()
-        bucket_summary = user_client.get_bucket_manager_summary()
+        snap = user_client.get_full_snapshot()
+        bucket_data = get_detailed_bucket_data(user_client.bucket_manager, snap['snapshot'], snap['revision'])
+        status = snap['status']
+        bucket_summary = snap['bucket_summary']
         
-        return JsonResponse({
+        return fast_json_response({
             'success': True,
             'message': result_msg,
             'bucket_data': bucket_data,
@@ -370,41 +724,55 @@ def test_bucket_operations(request):
         })
         
     except Exception as e:
-        return JsonResponse({
+        return fast_json_response({
             'success': False,
             'error': str(e)
         }, status=500)
 
 
+# ((bucket manager revision, export timestamp), page bytes) of the last export;
+# the timestamp only has minute resolution, so a refresh within the minute is
+# byte-for-byte the same page
+_export_page_cache = (None, None)
+
+
 def export_budget_data(request):
     """Export budget data to a comprehensive report page"""
+    global _export_page_cache
     try:
-        session = ChatSession()
-        user_client = session.get_user_client()
-        
-        # Get comprehensive budget data
-        bucket_data = get_detailed_bucket_data(user_client.bucket_manager)
-        status = user_client.get_status()
-        bucket_summary = user_client.get_bucket_manager_summary()
+        user_client = CHAT_SESSION.get_user_client(request)
         
         # Generate export timestamp
         export_timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
         
+        revision = user_client.bucket_manager.get_revision()
+        cached_key, cached_page = _export_page_cache
+        if cached_key == (revision, export_timestamp):
+            return HttpResponse(cached_page)
+        
+        # Get comprehensive budget data
+        snap = user_client.get_full_snapshot()
+        bucket_data = get_detailed_bucket_data(user_client.bucket_manager, snap['snapshot'], snap['revision'])
+        total_budget, total_percentage, _ = snap['snapshot']
+        unallocated_percentage = 100 - total_percentage
+        
         # Prepare context for the export template
         context = {
             'bucket_data': bucket_data,
-            'status': status,
-            'bucket_summary': bucket_summary,
+            'status': snap['status'],
+            'bucket_summary': snap['bucket_summary'],
             'export_timestamp': export_timestamp,
-            'total_budget': bucket_data.get('total_budget', 0),
-            'total_percentage': bucket_data.get('total_percentage', 0),
-            'buckets': bucket_data.get('buckets', []),
-            'bucket_count': len(bucket_data.get('buckets', [])),
-            'unallocated_percentage': max(0, 100 - bucket_data.get('total_percentage', 0)),
-            'unallocated_amount': max(0, bucket_data.get('total_budget', 0) * (100 - bucket_data.get('total_percentage', 0)) / 100)
+            'total_budget': total_budget,
+            'total_percentage': total_percentage,
+            'buckets': bucket_data['buckets'],
+            'bucket_count': len(bucket_data['buckets']),
+            'unallocated_percentage': max(0, unallocated_percentage),
+            'unallocated_amount': max(0, total_budget * unallocated_percentage / 100)
         }
         
-        return render(request, 'chat/export.html', context)
+        response = render(request, 'chat/export.html', context)
+        _export_page_cache = ((snap['revision'], export_timestamp), response.content)
+        return response
         
     except Exception as e:
         # Return error page if export fails
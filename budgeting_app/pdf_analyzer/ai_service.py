@@ -8,11 +8,32 @@ from typing import Dict, List, Any
 from decimal import Decimal
 from datetime import date, datetime
 import google.generativeai as genai
+import orjson
 from django.conf import settings
 import os
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(response_text: str) -> Any:
+    """Parse the first complete JSON object in a model reply.
+
+    The reply may wrap the JSON in prose or code fences. Decoding starts at the
+    first '{' and stops where that object closes, so braces in any trailing
+    text are ignored. A reply with no '{' is parsed as a whole.
+    """
+    start = response_text.find('{')
+    if start == -1:
+        return orjson.loads(response_text)
+    try:
+        # Usual case: the object runs to the last '}' (bare JSON or a code fence)
+        return orjson.loads(response_text[start:response_text.rfind('}') + 1])
+    except orjson.JSONDecodeError:
+        parsed, _ = _JSON_DECODER.raw_decode(response_text, start)
+        return parsed
+
 
 class GeminiAnalyzer:
     """Service class for analyzing transaction data using Google's Gemini AI"""
@@ -168,15 +189,8 @@ Be encouraging but honest about areas needing improvement. Use specific numbers
     def _parse_gemini_response(self, response_text: str, summary_stats: Dict) -> Dict:
         """Parse and validate Gemini's JSON response"""
         try:
-            # Try to extract JSON from the response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                parsed_response = json.loads(json_str)
-            else:
-                # Fallback: try parsing the entire response
-                parsed_response = json.loads(response_text)
+            # Extract the JSON object from the response
+            parsed_response = _extract_json_object(response_text)
             
             # Validate and structure the response
             analysis_result = {
@@ -312,14 +326,8 @@ Focus on:
     def _parse_pdf_analysis_response(self, response_text: str) -> Dict:
         """Parse Gemini's PDF analysis response"""
         try:
-            # Clean up the response and extract JSON
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                parsed_response = json.loads(json_str)
-            else:
-                parsed_response = json.loads(response_text)
+            # Extract the JSON object from the response
+            parsed_response = _extract_json_object(response_text)
             
             # Validate required structure
             required_keys = ['transactions', 'financial_summary', 'category_breakdown']
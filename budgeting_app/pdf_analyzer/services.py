@@ -54,6 +54,41 @@ class PDFProcessor:
             'banking': r'(bank|fee|atm|overdraft|transfer|interest)',
         }
 
+        self._build_keyword_matchers()
+
+    def _build_keyword_matchers(self):
+        """Precompile the keyword tables used by the per-transaction classifiers.
+
+        Transaction type keywords are folded into one alternation so a description
+        is scanned once for every keyword; the lookahead reports overlapping hits
+        (e.g. both 'transfer in' and 'interest' in 'transfer interest').
+        """
+        type_groups = [
+            ('fee', ['fee', 'charge', 'overdraft']),
+            ('interest', ['interest', 'dividend']),
+            ('credit', self.credit_keywords),
+            ('debit', self.debit_keywords),
+        ]
+        self._type_priority = {transaction_type: rank for rank, (transaction_type, _) in enumerate(type_groups)}
+        # Highest-priority group wins for keywords listed in more than one group
+        self._keyword_types = {}
+        for transaction_type, keywords in reversed(type_groups):
+            for keyword in keywords:
+                self._keyword_types[keyword] = transaction_type
+        ordered = sorted(
+            self._keyword_types,
+            key=lambda k: (self._type_priority[self._keyword_types[k]], -len(k)),
+        )
+        self._type_keyword_re = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+        # Sign markers only: the DR/CR word alternatives were always tested
+        # against a lowercased line and so never matched
+        self._debit_marker_re = re.compile(r'[\-\(]')
+        self._credit_marker_re = re.compile(r'\+')
+        self._category_res = [
+            (category, re.compile(pattern, re.IGNORECASE))
+            for category, pattern in self.category_patterns.items()
+        ]
+
     def extract_complete_pdf_content(self, pdf_file) -> Dict:
         """Extract complete PDF content formatted for Gemini AI analysis"""
         try:
@@ -377,27 +412,17 @@ class PDFProcessor:
     def _determine_transaction_type(self, description: str, full_line: str) -> str:
         """Determine if transaction is debit, credit, fee, or interest"""
         desc_lower = description.lower()
-        line_lower = full_line.lower()
         
-        # Check for specific transaction types first
-        if any(keyword in desc_lower for keyword in ['fee', 'charge', 'overdraft']):
-            return 'fee'
-        
-        if any(keyword in desc_lower for keyword in ['interest', 'dividend']):
-            return 'interest'
-        
-        # Check for credit indicators
-        if any(keyword in desc_lower for keyword in self.credit_keywords):
-            return 'credit'
-        
-        # Check for debit indicators  
-        if any(keyword in desc_lower for keyword in self.debit_keywords):
-            return 'debit'
+        # Fee, then interest, then credit, then debit keywords, in one scan
+        hits = {self._keyword_types[keyword] for keyword in self._type_keyword_re.findall(desc_lower)}
+        if hits:
+            return min(hits, key=self._type_priority.__getitem__)
         
-        # Look for visual indicators in the full line (-, +, CR, DR)
-        if re.search(r'[\-\(]|\bDR\b', line_lower):
+        # Look for visual indicators in the full line (-, +); case doesn't
+        # matter, so no lowercased copy is needed
+        if self._debit_marker_re.search(full_line):
             return 'debit'
-        if re.search(r'[\+]|\bCR\b', line_lower):
+        if self._credit_marker_re.search(full_line):
             return 'credit'
         
         # Default assumption based on common banking conventions
@@ -407,8 +432,8 @@ class PDFProcessor:
         """Categorize transaction based on description"""
         desc_lower = description.lower()
         
-        for category, pattern in self.category_patterns.items():
-            if re.search(pattern, desc_lower, re.IGNORECASE):
+        for category, pattern in self._category_res:
+            if pattern.search(desc_lower):
                 return category
         
         return 'other'